@@ -0,0 +1,119 @@
+#!/bin/env python3
+"""
+Fake compiler and archiver used by the benchmarks, writing placeholder outputs instantly, so timings isolate PyMake's overhead.
+"""
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+#   Hashlib
+import hashlib
+#   OS
+import os
+#   Re
+import re
+#   Shlex
+import shlex
+#   Sys
+import sys
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# Matches quoted includes, which are the only ones generated benchmark projects use
+INCLUDE_PATTERN = re.compile(r'^\s*#\s*include\s+"([^"]+)"', re.MULTILINE)
+
+
+# =============================================================================
+# >> FAKE TOOLCHAIN FUNCTIONS
+# =============================================================================
+def expand_response_files(args):
+    """Return the arguments with '@file' arguments replaced by the arguments read from those GNU response files."""
+    expanded = list()
+
+    for arg in args:
+        if arg.startswith("@") and os.path.isfile(arg[1:]):
+            with open(arg[1:]) as response_fp:
+                expanded.extend(shlex.split(response_fp.read()))
+        else:
+            expanded.append(arg)
+
+    return expanded
+
+
+def includes(source_file):
+    """Return the files included by a source file and the files they include, relative to the including file."""
+    found = dict()
+    pending = [source_file]
+
+    while pending:
+        path = pending.pop()
+
+        try:
+            with open(path) as source_fp:
+                names = INCLUDE_PATTERN.findall(source_fp.read())
+        except OSError:
+            continue
+
+        for name in names:
+            include = os.path.normpath(os.path.join(os.path.dirname(path), name))
+
+            if include not in found:
+                found[include] = None
+                pending.append(include)
+
+    return tuple(found)
+
+
+def write_output(output, input_files):
+    """Write an output file whose content changes whenever the content of an input file changes."""
+    digest = hashlib.blake2b(digest_size=16)
+
+    for input_file in input_files:
+        with open(input_file, "rb") as input_fp:
+            digest.update(input_fp.read())
+
+    with open(output, "w") as output_fp:
+        output_fp.write(f"{digest.hexdigest()}\n")
+
+
+def compiler(args):
+    """Write the object file and depfile a compiler would write for the given arguments."""
+    output = args[args.index("-o") + 1]
+    source_file = args[args.index("-c") + 1] if "-c" in args else None
+
+    # Other outputs than objects depend on the files passed in, e.g. linked objects
+    if source_file is None:
+        write_output(output, tuple(arg for arg in args if arg != output and os.path.isfile(arg)))
+        return
+
+    # Objects depend on the source file and its headers
+    input_files = (source_file, *includes(source_file))
+    write_output(output, input_files)
+
+    # Write a Makefile-format depfile listing the source file and every header it includes
+    if "-MF" in args:
+        with open(args[args.index("-MF") + 1], "w") as depfile_fp:
+            depfile_fp.write(f"{output}: {' '.join(input_files)}\n")
+
+
+def archiver(args):
+    """Write the archive an archiver would write for the given arguments, i.e. 'ar <operations> <archive> <members>'."""
+    write_output(args[1], args[2:])
+
+
+def main(args):
+    """Act as the tool named by the first argument."""
+    tool, args = args[0], expand_response_files(args[1:])
+
+    if tool == "ar":
+        archiver(args)
+    else:
+        compiler(args)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,344 @@
+#!/bin/env python3
+"""
+Benchmarks measuring PyMake's own overhead on generated projects, built via a fake toolchain.
+"""
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+#   Argparse
+import argparse
+#   JSON
+import json
+#   OS
+import os
+#   Pathlib
+from pathlib import Path
+#   Platform
+import platform
+#   Shutil
+import shutil
+#   Statistics
+import statistics
+#   Subprocess
+import subprocess
+#   Sys
+import sys
+#   Tempfile
+import tempfile
+#   Time
+import time
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# The directory holding the benchmarks and the repository root
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+ROOT_DIR = BENCHMARKS_DIR.parent
+
+# The results file format version, increased whenever results become incomparable to older ones
+RESULTS_VERSION = 2
+
+# The measured values of each run, compared against baselines
+METRICS = ("wall", "configure", "build", "max_rss", "tree_max_rss")
+
+
+# =============================================================================
+# >> PROJECT FUNCTIONS
+# =============================================================================
+def generate_project(project_dir, targets, sources, headers, fan_in, globs):
+    """Write a project with a chain of static libraries linked into an executable, sharing headers."""
+    include_dir = project_dir.joinpath("include")
+    include_dir.mkdir(parents=True)
+
+    for header in range(headers):
+        include_dir.joinpath(f"h{header}.hpp").write_text(f"#pragma once\nint h{header}();\n")
+
+    target_lines = list()
+
+    for target in range(targets):
+        name = f"t{target}"
+        target_dir = project_dir.joinpath(name)
+        target_dir.mkdir()
+
+        source_files = list()
+
+        for source in range(sources):
+            # Spread includes over all headers, so each header is included by about `sources * fan_in / headers` files
+            included = dict.fromkeys((target * sources + source + step * 7) % headers for step in range(fan_in))
+            lines = [f'#include "../include/h{header}.hpp"' for header in included]
+            lines.append(f"int {name}_s{source}() {{ return {source}; }}")
+
+            target_dir.joinpath(f"s{source}.cpp").write_text("\n".join(lines) + "\n")
+            source_files.append(f"{name}/s{source}.cpp")
+
+        # The last target is the executable depending on the chain of libraries
+        is_executable = target == targets - 1
+
+        target_lines.extend((
+            f"  {name}:",
+            f"    source_files: {json.dumps([f'{name}/*.cpp'] if globs else source_files)}",
+            f"    output: {'app' if is_executable else name}",
+            f"    output_type: {'executable' if is_executable else 'static_library'}"
+        ))
+
+        if target:
+            target_lines.append(f"    depends_on: t{target - 1}")
+
+    project_dir.joinpath("pymake.yml").write_text("\n".join((
+        'name: "Benchmark"',
+        'description: "Generated benchmark project"',
+        'version: "1.0"',
+        'build_dir: "build"',
+        "toolchains:",
+        "  g++: {}",
+        "targets:",
+        *target_lines
+    )) + "\n")
+
+
+def install_toolchain(bin_dir):
+    """Write 'g++' and 'ar' executables running the fake toolchain into the given directory."""
+    bin_dir.mkdir()
+
+    for tool in ("g++", "ar"):
+        path = bin_dir.joinpath(tool)
+        path.write_text(
+            f'#!/bin/sh\nexec "{sys.executable}" -S -E "{BENCHMARKS_DIR.joinpath("fake_toolchain.py")}" {tool} "$@"\n'
+        )
+        path.chmod(0o755)
+
+
+def edit(path, line):
+    """Append a line to a file, changing its content."""
+    with path.open("a") as file_fp:
+        file_fp.write(f"{line}\n")
+
+
+def touch(path):
+    """Bump the mtime of a file without changing its content."""
+    stat_result = path.stat()
+    os.utime(path, ns=(stat_result.st_atime_ns, max(time.time_ns(), stat_result.st_mtime_ns + 1)))
+
+
+# =============================================================================
+# >> MEASUREMENT FUNCTIONS
+# =============================================================================
+def trace_phases(trace_path):
+    """Return the seconds spent configuring and building, the number of jobs run and PyMake's own peak RSS from a PyMake trace file."""
+    with trace_path.open() as trace_fp:
+        trace = json.load(trace_fp)
+
+    events = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+
+    phases = {"configure": 0.0, "build": 0.0}
+    end = None
+
+    # Only count the outermost steps of the main track, as nested steps are already part of them
+    for event in sorted((event for event in events if event["tid"] == 0), key=lambda event: (event["ts"], -event["dur"])):
+        if end is not None and event["ts"] + event["dur"] <= end:
+            continue
+
+        end = event["ts"] + event["dur"]
+        phases[event["cat"]] = phases.get(event["cat"], 0.0) + event["dur"] / 1e6
+
+    phases["jobs"] = sum(1 for event in events if event["tid"] != 0)
+    phases["max_rss"] = trace.get("otherData", {}).get("max_rss", 0)
+
+    return phases
+
+
+def run_pymake(project_dir, env, jobs, *args):
+    """Run PyMake in the project dir and return its wall-clock time, peak RSS of the process tree and trace phases."""
+    command = (sys.executable, ROOT_DIR.joinpath("pymake.py").as_posix(), "-j", str(jobs), "--no-cache", "--trace", *args)
+
+    start = time.perf_counter()
+
+    with subprocess.Popen(command, cwd=project_dir, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT) as process:
+        output = process.stdout.read()
+        _, status, usage = os.wait4(process.pid, 0)
+        process.returncode = os.waitstatus_to_exitcode(status)
+
+    wall = time.perf_counter() - start
+
+    if process.returncode != 0:
+        raise RuntimeError(f"PyMake failed with exit code {process.returncode}:\n{output.decode(errors='replace')}")
+
+    # `ru_maxrss` is given in kilobytes on Linux and covers the fake toolchain processes as well,
+    # unlike the peak RSS of PyMake itself taken from the trace
+    return {
+        "wall": wall,
+        "tree_max_rss": usage.ru_maxrss << 10,
+        **trace_phases(project_dir.joinpath("build", "pymake_trace.json"))
+    }
+
+
+def run_scenarios(project_dir, env, jobs, repetition):
+    """Run each scenario once and return the measurements by scenario name."""
+    results = dict()
+
+    # Build everything from scratch, including configuring the project
+    shutil.rmtree(project_dir.joinpath("build"), ignore_errors=True)
+    shutil.rmtree(project_dir.joinpath(".pymake"), ignore_errors=True)
+    results["clean"] = run_pymake(project_dir, env, jobs)
+
+    # Nothing changed, so only up-to-date checks run
+    results["noop"] = run_pymake(project_dir, env, jobs)
+
+    # Configure the project again, with nothing to build
+    results["configure"] = run_pymake(project_dir, env, jobs, "--reconfigure")
+
+    # A touched but unchanged source file is hashed, but not rebuilt
+    touch(project_dir.joinpath("t0", "s0.cpp"))
+    results["touch_source"] = run_pymake(project_dir, env, jobs)
+
+    # An edited source file of the first target rebuilds it and every target linking against it
+    edit(project_dir.joinpath("t0", "s0.cpp"), f"// edit {repetition}")
+    results["edit_source"] = run_pymake(project_dir, env, jobs)
+
+    # An edited header rebuilds every source file including it
+    edit(project_dir.joinpath("include", "h0.hpp"), f"// edit {repetition}")
+    results["edit_header"] = run_pymake(project_dir, env, jobs)
+
+    return results
+
+
+def summarize(runs):
+    """Return the median of each metric over the runs of a scenario."""
+    return {metric: statistics.median(run[metric] for run in runs) for metric in (*METRICS, "jobs")}
+
+
+# =============================================================================
+# >> REPORT FUNCTIONS
+# =============================================================================
+def format_metric(metric, value):
+    """Return a metric value formatted for display."""
+    if metric.endswith("max_rss"):
+        return f"{value / (1 << 20):.1f} MiB"
+
+    return f"{value:.3f}s"
+
+
+def print_results(results, baseline=None):
+    """Print the median metrics of each scenario, compared to those of a baseline if given."""
+    for scenario, summary in results["scenarios"].items():
+        columns = list()
+
+        for metric in METRICS:
+            column = f"{metric} {format_metric(metric, summary['median'][metric])}"
+
+            base = None if baseline is None else baseline["scenarios"].get(scenario, {}).get("median", {}).get(metric)
+
+            if base:
+                column += f" ({(summary['median'][metric] - base) / base:+.1%})"
+
+            columns.append(column)
+
+        print(f"{scenario:<13} {'  '.join(columns)}  jobs {summary['median']['jobs']:g}")
+
+
+# =============================================================================
+# >> BENCHMARK FUNCTIONS
+# =============================================================================
+def parse_arguments(args=None):
+    """Parse the command line arguments."""
+    parser = argparse.ArgumentParser(description="Measure PyMake's overhead on a generated project.")
+
+    parser.add_argument("--targets", type=int, default=10, help="number of targets (default: %(default)s)")
+    parser.add_argument("--sources", type=int, default=50, help="number of source files per target (default: %(default)s)")
+    parser.add_argument("--headers", type=int, default=20, help="number of shared headers (default: %(default)s)")
+    parser.add_argument("--fan-in", type=int, default=5, help="number of headers each source file includes (default: %(default)s)")
+    parser.add_argument("--no-globs", dest="globs", action="store_false", help="list source files instead of using glob patterns")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="number of jobs PyMake runs at once (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=3, help="number of times to run each scenario (default: %(default)s)")
+    parser.add_argument("-o", "--output", type=Path, default=Path("pymake_benchmark.json"), help="results file (default: %(default)s)")
+    parser.add_argument("--compare", type=Path, metavar="BASELINE", help="results file to compare the results to")
+    parser.add_argument("--keep", action="store_true", help="keep the generated project and print its path")
+
+    arguments = parser.parse_args(args)
+
+    if min(arguments.targets, arguments.sources, arguments.headers, arguments.jobs, arguments.repeat) < 1:
+        parser.error("targets, sources, headers, jobs and repeat must be at least 1")
+
+    if not 0 <= arguments.fan_in <= arguments.headers:
+        parser.error("the fan-in must be between 0 and the number of headers")
+
+    return arguments
+
+
+def main(args=None):
+    arguments = parse_arguments(args)
+
+    baseline = None
+
+    if arguments.compare is not None:
+        with arguments.compare.open() as baseline_fp:
+            baseline = json.load(baseline_fp)
+
+        if baseline.get("version") != RESULTS_VERSION:
+            print(f"[WARN] {arguments.compare} has been written by another version of the benchmarks, not comparing...")
+            baseline = None
+
+    project = {
+        "targets": arguments.targets,
+        "sources": arguments.sources,
+        "headers": arguments.headers,
+        "fan_in": arguments.fan_in,
+        "globs": arguments.globs
+    }
+
+    if baseline is not None and (baseline["project"] != project or baseline["jobs"] != arguments.jobs):
+        print(f"[WARN] {arguments.compare} has been measured on another project or job count")
+
+    work_dir = Path(tempfile.mkdtemp(prefix="pymake_benchmark_"))
+    project_dir = work_dir.joinpath("project")
+
+    try:
+        generate_project(project_dir, **project)
+        install_toolchain(work_dir.joinpath("bin"))
+
+        # Find the fake toolchain first, and don't share objects via a remote cache
+        env = dict(os.environ, PATH=os.pathsep.join((work_dir.joinpath("bin").as_posix(), os.environ.get("PATH", ""))))
+        env.pop("PYMAKE_REMOTE_CACHE", None)
+
+        runs = dict()
+
+        for repetition in range(arguments.repeat):
+            for scenario, result in run_scenarios(project_dir, env, arguments.jobs, repetition).items():
+                runs.setdefault(scenario, list()).append(result)
+    finally:
+        if arguments.keep:
+            print(f"[INFO] Kept the generated project in {project_dir}")
+        else:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    try:
+        commit = subprocess.run(
+            ("git", "rev-parse", "HEAD"), cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    results = {
+        "version": RESULTS_VERSION,
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "project": project,
+        "jobs": arguments.jobs,
+        "scenarios": {
+            scenario: {"median": summarize(scenario_runs), "runs": scenario_runs}
+            for scenario, scenario_runs in runs.items()
+        }
+    }
+
+    with arguments.output.open("w") as results_fp:
+        json.dump(results, results_fp, indent=2)
+
+    print_results(results, baseline)
+    print(f"[INFO] Results written to {arguments.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,20 +2,54 @@
 # >> IMPORTS
 # =============================================================================
 # Python Imports
+#   Argparse
+import argparse
 #   Importlib
 import importlib.util
+#   Multiprocessing
+import multiprocessing
+#   OS
+import os
 #   Pathlib
 from pathlib import Path
+#   Sys
+import sys
 
 # PyMake Imports
+#   Cache
+from pymake.cache import CacheBackendBase
+from pymake.cache import HttpCacheBackend
+from pymake.cache import ObjectCache
+#   Configure
+from pymake.configure import ConfigureCache
+#   Daemon
+from pymake.daemon import BuildDaemon
+#   Generators
+from pymake.generators import GeneratorBase
+from pymake.generators import NinjaGenerator
+#   Listeners
+from pymake.listeners.managers import ListenerManager
 #   Projects
 from pymake.projects import ProjectData
+#   Report
+from pymake.report import BuildReport
+#   State
+from pymake.state import BuildState
+#   Stats
+from pymake.stats import JobStats
+#   Toolchains
+from pymake.toolchains.base import ToolchainBase
 #   Toolchains: Clang
 from pymake.toolchains.clang import ClangToolchainC
 from pymake.toolchains.clang import ClangToolchainCXX
 #   Toolchains: GCC
 from pymake.toolchains.gcc import GccToolchainC
 from pymake.toolchains.gcc import GccToolchainCXX
+#   Trace
+from pymake.trace import BuildTrace
+from pymake.trace import span
+#   Watch
+from pymake.watch import WatcherBase
 
 
 def register_toolchains():
@@ -31,22 +65,310 @@ def register_toolchains():
         toolchain.register()
 
 
-def main():
-    register_toolchains()
+def register_cache_backends():
+    """Register remote object cache backends."""
+    backends = (
+        HttpCacheBackend,
+    )
 
-    # Load the make.py module, if it exists
-    make_py = Path("make.py")
+    for backend in backends:
+        backend.register()
+
+
+def register_generators():
+    """Register build file generators."""
+    generators = (
+        NinjaGenerator,
+    )
+
+    for generator in generators:
+        generator.register()
+
+
+def parse_arguments(args=None):
+    """Parse the command line arguments."""
+    parser = argparse.ArgumentParser(prog="pymake", description="Simple build system based on Python.")
+
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=multiprocessing.cpu_count(),
+        help="number of jobs to run simultaneously (default: %(default)s)"
+    )
+
+    parser.add_argument(
+        "--no-cache", dest="cache", action="store_false",
+        help="don't reuse object files from the object cache"
+    )
+
+    parser.add_argument(
+        "--cache-dir", type=Path, default=ObjectCache.default_directory(),
+        help="object cache directory (default: %(default)s)"
+    )
+
+    parser.add_argument(
+        "--cache-size", type=int, default=5120, metavar="MiB",
+        help="maximum object cache size in MiB (default: %(default)s)"
+    )
+
+    parser.add_argument(
+        "--remote-cache", default=os.environ.get("PYMAKE_REMOTE_CACHE"), metavar="URL",
+        help="URL of a remote object cache to share object files with, e.g. a `pymake.cache_server` instance"
+    )
+
+    parser.add_argument(
+        "--reconfigure", action="store_true",
+        help="configure the project again, even if nothing it has been configured from changed"
+    )
+
+    parser.add_argument(
+        "--rsp-threshold", type=int, default=ToolchainBase.response_file_threshold, metavar="BYTES",
+        help="pass arguments of longer commands via response files, 0 to never use them (default: %(default)s)"
+    )
+
+    parser.add_argument(
+        "--watch", action="store_true",
+        help="keep running and build again whenever source files, 'pymake.yml' or 'make.py' change"
+    )
 
+    parser.add_argument(
+        "--daemon", action="store_true",
+        help="keep the configured project in memory and build it on request of 'pymake_client.py' until stopped"
+    )
+
+    parser.add_argument(
+        "--generate", metavar="GENERATOR",
+        help="write a build file for another build system to the build dir instead of building, e.g. 'ninja'"
+    )
+
+    parser.add_argument(
+        "--trace", action="store_true",
+        help="write the timing of configure steps and jobs to '<build_dir>/pymake_trace.json' in Chrome trace format"
+    )
+
+    parser.add_argument(
+        "--memory-budget", type=int, metavar="MiB",
+        help="only start jobs while the peak RSS they needed in previous runs adds up to at most MiB"
+    )
+
+    parser.add_argument(
+        "--link-jobs", type=int, metavar="N",
+        help="run at most N link and archive jobs at once, within the --jobs limit (default: no separate limit)"
+    )
+
+    parser.add_argument(
+        "--report", type=int, default=0, metavar="N",
+        help="list the N slowest and most memory-hungry translation units of each target and toolchain after building"
+    )
+
+    arguments = parser.parse_args(args)
+
+    if arguments.jobs < 1:
+        parser.error("the number of jobs must be at least 1")
+
+    if arguments.memory_budget is not None and arguments.memory_budget < 1:
+        parser.error("the memory budget must be at least 1 MiB")
+
+    if arguments.link_jobs is not None and arguments.link_jobs < 1:
+        parser.error("the number of link jobs must be at least 1")
+
+    if arguments.report < 0:
+        parser.error("the number of reported translation units must not be negative")
+
+    if arguments.generate is not None and (arguments.watch or arguments.daemon):
+        parser.error("--generate can't be combined with --watch or --daemon")
+
+    return arguments
+
+
+def load_make_py(make_py):
+    """Execute the make.py module, registering its listeners."""
+    # Drop listeners registered by a previous execution
+    ListenerManager.unregister_all()
+
+    spec = importlib.util.spec_from_file_location("make", make_py.as_posix())
+    make = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(make)
+
+
+def configure(make_py, reconfigure=False, trace=None):
+    """Load the make.py module, if it exists, and return the `ProjectData` instance of the project."""
     if make_py.exists():
-        spec = importlib.util.spec_from_file_location("make", make_py.as_posix())
-        make = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(make)
+        with span(trace, "Load make.py"):
+            load_make_py(make_py)
+
+    # Toolchain executables may have been replaced since they have been looked at
+    ToolchainBase.identities.clear()
 
     # Get project data from the YAML file inside the current working directory
-    data = ProjectData.read("pymake.yml")
+    return ProjectData.read("pymake.yml", make_py, reconfigure, trace)
+
+
+def build(arguments, data, trace=None):
+    """Build the project as configured via the command line and return whether it succeeded."""
+    # Reuse object files compiled before, unless disabled
+    cache = None
+
+    if arguments.cache:
+        remote = None if arguments.remote_cache is None else CacheBackendBase.create(arguments.remote_cache)
+        cache = ObjectCache(arguments.cache_dir, arguments.cache_size << 20, remote)
+
+    # Collect the resource usage of translation units, if requested
+    report = BuildReport(arguments.report) if arguments.report else None
+
+    # Build the targets in parallel
+    try:
+        return data.build_parallel(
+            arguments.jobs, cache, trace, report,
+            None if arguments.memory_budget is None else arguments.memory_budget << 20, arguments.link_jobs
+        )
+    finally:
+        if trace is not None:
+            trace.save(data.build_dir.joinpath("pymake_trace.json"))
+            print(f"[INFO] Build trace written to {data.build_dir.joinpath('pymake_trace.json')}")
+
+
+def generate(arguments, make_py, data):
+    """Write the build file of the requested generator, which runs pymake again to regenerate it when necessary."""
+    # Pass on the options affecting the build file
+    regenerate_command = [
+        sys.executable, Path(sys.argv[0]).resolve().as_posix(), "--generate", arguments.generate,
+        "--rsp-threshold", str(arguments.rsp_threshold)
+    ]
+
+    if arguments.link_jobs is not None:
+        regenerate_command.extend(("--link-jobs", str(arguments.link_jobs)))
+
+    # Directories of the source dir are included, since glob patterns may match different files
+    regenerate_inputs = ["pymake.yml", *data.source_directories()]
+
+    if make_py.exists():
+        regenerate_inputs.append(make_py.as_posix())
+
+    generator = GeneratorBase.create(
+        arguments.generate, data, tuple(regenerate_command), tuple(regenerate_inputs), arguments.link_jobs
+    )
+
+    if generator.save():
+        print(f"[INFO] Generated {generator.path}")
+    else:
+        print(f"[INFO] {generator.path} is up to date")
+
+
+def watch(arguments, make_py, data):
+    """Rebuild the project whenever its source files change, until interrupted."""
+    project_files = {Path("pymake.yml").absolute(), make_py.absolute()}
+
+    while True:
+        directories = data.source_directories()
+
+        # Source files being added, removed or renamed requires matching glob patterns again
+        stamps = ConfigureCache.stamps(directories)
+
+        print(f"[INFO] Watching {len(directories)} directories for changes, press Ctrl+C to stop...")
+
+        with WatcherBase.create(directories, project_files) as watcher:
+            while True:
+                changes = watcher.wait()
+                trace = BuildTrace() if arguments.trace else None
+
+                # Reconfigure only if the project files or directories changed, otherwise just build again
+                reconfigure = not project_files.isdisjoint(path.absolute() for path in changes)
+
+                if reconfigure or ConfigureCache.stamps(directories) != stamps:
+                    try:
+                        data = configure(make_py, reconfigure, trace)
+                    except Exception as error:
+                        # Keep watching, as the next change may fix the project files
+                        print(f"[ERROR] Could not configure the project: {error}")
+                        continue
+
+                    build(arguments, data, trace)
+                    break
+
+                build(arguments, data, trace)
+
+
+def serve(make_py):
+    """Serve build requests of 'pymake_client.py', keeping the configured project and build states in memory."""
+    # Keep build states and job stats loaded between builds
+    BuildState.loaded = dict()
+    JobStats.loaded = dict()
+
+    # The configured project and what it has been configured from
+    data = None
+    key = None
+    stamps = None
+
+    def build_request(args):
+        nonlocal data, key, stamps
+
+        arguments = parse_arguments(args)
+
+        if arguments.watch or arguments.daemon or arguments.generate is not None:
+            print("[ERROR] Neither --watch, --daemon nor --generate can be requested from a daemon")
+            return 2
+
+        ToolchainBase.response_file_threshold = arguments.rsp_threshold or None
+        trace = BuildTrace() if arguments.trace else None
+
+        # Reconfigure only if anything the project has been configured from changed
+        current_key = ConfigureCache.digest((Path("pymake.yml"), make_py))
+
+        if arguments.reconfigure or data is None or current_key != key or ConfigureCache.stamps(stamps) != stamps:
+            data = configure(make_py, arguments.reconfigure, trace)
+            key = current_key
+            stamps = ConfigureCache.stamps(data.configure_paths())
+
+        return 0 if build(arguments, data, trace) else 1
+
+    with BuildDaemon(build_request) as daemon:
+        print(f"[INFO] Serving build requests in {Path.cwd()}, stop via 'pymake_client.py --stop'...")
+        daemon.serve()
+
+
+def main(args=None):
+    arguments = parse_arguments(args)
+
+    register_toolchains()
+    register_cache_backends()
+    register_generators()
+
+    make_py = Path("make.py")
+
+    # Keep running and build on request, if requested
+    if arguments.daemon:
+        try:
+            serve(make_py)
+        except KeyboardInterrupt:
+            pass
+
+        return
+
+    # Spill arguments of long commands into response files
+    ToolchainBase.response_file_threshold = arguments.rsp_threshold or None
+
+    # Record the timing of configure steps and jobs, if requested
+    trace = BuildTrace() if arguments.trace else None
+
+    data = configure(make_py, arguments.reconfigure, trace)
+
+    # Leave building to another build system, if requested
+    if arguments.generate is not None:
+        try:
+            generate(arguments, make_py, data)
+        except ValueError as error:
+            print(f"[ERROR] {error}")
+            raise SystemExit(2)
+
+        return
+
+    success = build(arguments, data, trace)
 
-    # Build the target sequentially
-    # data.build()
+    # Keep building whenever anything changes, if requested
+    if arguments.watch:
+        try:
+            watch(arguments, make_py, data)
+        except KeyboardInterrupt:
+            return
 
-    # Build the target in parallel
-    data.build_parallel()
+    if not success:
+        raise SystemExit(1)
@@ -0,0 +1,401 @@
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+#   Hashlib
+import hashlib
+#   JSON
+import json
+#   OS
+import os
+#   Pathlib
+from pathlib import Path
+#   Queue
+import queue
+#   Shutil
+import shutil
+#   Threading
+import threading
+#   Urllib
+import urllib.error
+import urllib.parse
+import urllib.request
+
+# PyMake Imports
+#   Depfiles
+from pymake.depfiles import parse_depfile
+#   Utils
+from pymake.utils import file_digest
+
+
+# =============================================================================
+# >> CACHE BACKEND BASE TYPE DEFINITION
+# =============================================================================
+class CacheBackendBase(object):
+    """Class used as a base for backends sharing object cache entries, e.g. across a CI fleet."""
+
+    # Static URL schemes handled by the backend
+    schemes = ()
+
+    # A dict holding backend classes by URL scheme
+    instances = dict()
+
+    def __init__(self, url):
+        """C'tor."""
+        # Store the backend URL
+        self.url = url
+
+    @classmethod
+    def register(cls):
+        """Register the backend class by its URL schemes."""
+        if not cls.schemes:
+            raise ValueError(f"Cannot register generic cache backend {cls.__name__}!")
+
+        for scheme in cls.schemes:
+            cls.instances[scheme] = cls
+
+    @staticmethod
+    def create(url):
+        """Return a backend instance for the given URL."""
+        scheme = urllib.parse.urlsplit(url).scheme
+
+        if scheme not in CacheBackendBase.instances:
+            raise ValueError(f"No cache backend found for URL {url}!")
+
+        return CacheBackendBase.instances[scheme](url)
+
+    def get(self, name):
+        """Return the content of an entry file, or None if it doesn't exist."""
+        raise NotImplementedError(f"{type(self).__name__} has no clue how to get entry files!")
+
+    def put(self, name, data):
+        """Store the content of an entry file without blocking the caller."""
+        raise NotImplementedError(f"{type(self).__name__} has no clue how to put entry files!")
+
+    def close(self):
+        """Wait for pending stores to finish."""
+
+
+# =============================================================================
+# >> HTTP CACHE BACKEND TYPE DEFINITION
+# =============================================================================
+class HttpCacheBackend(CacheBackendBase):
+    """Class used to share object cache entries via HTTP GET and PUT requests, e.g. with `pymake.cache_server`."""
+
+    schemes = ("http", "https")
+
+    # Seconds to wait for the server
+    timeout = 10
+
+    def __init__(self, url):
+        """C'tor."""
+        super().__init__(url.rstrip("/"))
+
+        # Uploads are queued and sent by a background thread, so they never delay the build
+        self.uploads = queue.Queue()
+        self.uploader = None
+
+        # Whether the server failed, in which case the backend is not used anymore
+        self.failed = False
+
+    def request(self, method, name, data=None):
+        """Send a request for an entry file and return the response body."""
+        request = urllib.request.Request(f"{self.url}/{name}", data=data, method=method)
+
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return response.read()
+
+    def fail(self, error):
+        """Stop using the backend after the first server failure."""
+        if not self.failed:
+            self.failed = True
+            print(f"[WARN] Remote object cache {self.url} failed: {error}. Not using it anymore...")
+
+    def get(self, name):
+        """Return the content of an entry file, or None if it doesn't exist."""
+        if self.failed:
+            return None
+
+        try:
+            return self.request("GET", name)
+        except urllib.error.HTTPError as error:
+            if error.code != 404:
+                self.fail(error)
+        except OSError as error:
+            self.fail(error)
+
+        return None
+
+    def upload(self):
+        """Send queued uploads until `None` is queued."""
+        while (item := self.uploads.get()) is not None:
+            if not self.failed:
+                try:
+                    self.request("PUT", *item)
+                except OSError as error:
+                    self.fail(error)
+
+    def put(self, name, data):
+        """Queue an entry file for upload."""
+        if self.uploader is None:
+            self.uploader = threading.Thread(target=self.upload, name="pymake-cache-upload", daemon=True)
+            self.uploader.start()
+
+        self.uploads.put((name, data))
+
+    def close(self):
+        """Wait for queued uploads to finish."""
+        if self.uploader is not None:
+            self.uploads.put(None)
+            self.uploader.join()
+            self.uploader = None
+
+
+# =============================================================================
+# >> OBJECT CACHE TYPE DEFINITION
+# =============================================================================
+class ObjectCache(object):
+    """Class used to reuse compiled object files across builds, keyed by the content they were compiled from."""
+
+    # Each cache entry consists of a '<key>.json' manifest and a '<key>.o' object file inside
+    # the '<key[:2]>' subdirectory. The key is derived from the compiler identity, the normalized
+    # compile command and the source file content. The manifest lists the digests of all headers
+    # the object file was compiled from, so an entry only hits if none of them changed.
+    # Precompiled headers aren't byte-reproducible, so they're accounted for by the headers they
+    # have been precompiled from instead.
+
+    def __init__(self, directory, max_size, remote=None):
+        """C'tor."""
+        # Store the cache directory and its maximum size in bytes
+        self.directory = Path(directory)
+        self.max_size = max_size
+
+        # Store the `CacheBackendBase` instance sharing entries with other machines, if any
+        self.remote = remote
+
+        # Hit and miss statistics of the current build
+        self.hits = 0
+        self.remote_hits = 0
+        self.misses = 0
+        self.stores = 0
+
+        # Digests of files already hashed during the current build
+        self.digests = dict()
+
+        # Lookups and stores happen in executor threads
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def default_directory():
+        """Return the default cache directory, i.e. '$PYMAKE_CACHE_DIR' or '~/.cache/pymake'."""
+        return Path(os.environ.get("PYMAKE_CACHE_DIR", Path.home().joinpath(".cache", "pymake")))
+
+    def digest(self, path):
+        """Return the content digest of a file."""
+        try:
+            return self.digests[path]
+        except KeyError:
+            digest = self.digests[path] = file_digest(path)
+            return digest
+
+    @staticmethod
+    def source_inputs(job, inputs):
+        """Return the inputs of a compile job as paths, with precompiled headers replaced by the headers they have been precompiled from."""
+        suffix = job.toolchain.precompiled_header_suffix
+        source_inputs = dict()
+
+        for input_file in map(Path, inputs):
+            if suffix is not None and input_file.name.endswith(suffix):
+                try:
+                    source_inputs.update(dict.fromkeys(parse_depfile(job.toolchain.depfile_path(input_file))))
+                    continue
+                except OSError:
+                    # Fall back to the precompiled header itself, which only costs cache hits
+                    pass
+
+            source_inputs[input_file.as_posix()] = None
+
+        return tuple(source_inputs)
+
+    def key(self, job):
+        """Return the cache key of a compile job."""
+        key = hashlib.blake2b(job.cache_key.encode(), digest_size=20)
+
+        for input_file in self.source_inputs(job, job.inputs):
+            key.update(self.digest(input_file).encode())
+
+        return key.hexdigest()
+
+    def entry_path(self, key, suffix):
+        """Return the path of a cache entry file."""
+        return self.directory.joinpath(key[:2], f"{key}{suffix}")
+
+    def count(self, attribute):
+        """Increment a statistics counter."""
+        with self.lock:
+            setattr(self, attribute, getattr(self, attribute) + 1)
+
+    def validate(self, inputs):
+        """Return whether none of the inputs changed since the digests of a manifest have been taken."""
+        return all(self.digest(input_file) == digest for input_file, digest in inputs)
+
+    def place(self, job, key):
+        """Replace the output of a compile job by a hardlink to the cached object file, or a copy if that's not possible."""
+        job.output.unlink(missing_ok=True)
+
+        try:
+            os.link(self.entry_path(key, ".o"), job.output)
+        except OSError:
+            shutil.copyfile(self.entry_path(key, ".o"), job.output)
+
+    def write_entry_file(self, key, suffix, data):
+        """Write a cache entry file via a temporary file, so simultaneous builds never see incomplete entries."""
+        path = self.entry_path(key, suffix)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        temp_path.write_bytes(data)
+        os.replace(temp_path, path)
+
+    def lookup(self, job, key):
+        """Place the cached object file of a compile job and return its inputs, or return None on a miss."""
+        manifest_path = self.entry_path(key, ".json")
+
+        try:
+            with manifest_path.open() as manifest_fp:
+                inputs = json.load(manifest_fp)
+
+            # Miss if any header changed since the object file has been cached
+            if not self.validate(inputs):
+                raise LookupError(key)
+
+            self.place(job, key)
+
+            # Mark the entry as recently used
+            os.utime(manifest_path)
+        except (OSError, ValueError, LookupError):
+            return self.fetch(job, key)
+
+        self.count("hits")
+        return self.cached_inputs(job, inputs)
+
+    def fetch(self, job, key):
+        """Fetch an entry missing from the local cache from the remote backend, then place it like `lookup`."""
+        if self.remote is None:
+            self.count("misses")
+            return None
+
+        try:
+            manifest_data = self.remote.get(f"{key}.json")
+
+            if manifest_data is None:
+                raise LookupError(key)
+
+            inputs = json.loads(manifest_data)
+
+            if not self.validate(inputs):
+                raise LookupError(key)
+
+            object_data = self.remote.get(f"{key}.o")
+
+            if object_data is None:
+                raise LookupError(key)
+
+            # Keep the entry locally, writing the object file before the manifest referencing it
+            self.write_entry_file(key, ".o", object_data)
+            self.write_entry_file(key, ".json", manifest_data)
+            self.place(job, key)
+        except (OSError, ValueError, LookupError):
+            self.count("misses")
+            return None
+
+        self.count("hits")
+        self.count("remote_hits")
+        return self.cached_inputs(job, inputs)
+
+    @staticmethod
+    def cached_inputs(job, inputs):
+        """Return the inputs to record for a cached object file, keeping precompiled headers for up-to-date checks."""
+        return tuple(dict.fromkeys((*(input_file.as_posix() for input_file in job.inputs), *(
+            input_file for input_file, _ in inputs
+        ))))
+
+    def store(self, job, key, inputs):
+        """Store the object file of a successfully run compile job, along with the digests of its inputs."""
+        manifest_data = json.dumps([
+            (input_file, self.digest(input_file)) for input_file in self.source_inputs(job, inputs)
+        ], separators=(",", ":")).encode()
+
+        try:
+            object_data = job.output.read_bytes()
+
+            # Write the object file before the manifest referencing it
+            self.write_entry_file(key, ".o", object_data)
+            self.write_entry_file(key, ".json", manifest_data)
+        except OSError as error:
+            print(f"[WARN] Could not store {job.output} in the object cache: {error}")
+            return
+
+        self.count("stores")
+
+        # Share the entry in the background
+        if self.remote is not None:
+            self.remote.put(f"{key}.o", object_data)
+            self.remote.put(f"{key}.json", manifest_data)
+
+    def trim(self):
+        """Evict the least recently used entries until the cache fits its maximum size."""
+        # Nothing has been added during this build
+        if not self.stores:
+            return
+
+        entries = list()
+        size = 0
+
+        for subdir in os.scandir(self.directory):
+            if not subdir.is_dir():
+                continue
+
+            for entry in os.scandir(subdir.path):
+                stat_result = entry.stat()
+                size += stat_result.st_size
+
+                if entry.name.endswith(".json"):
+                    # Objects are accounted for along with their manifests
+                    object_path = entry.path[:-len(".json")] + ".o"
+
+                    try:
+                        object_size = os.stat(object_path).st_size
+                    except OSError:
+                        object_size = 0
+
+                    entries.append((stat_result.st_mtime_ns, entry.path, object_path, stat_result.st_size + object_size))
+
+        # Evict the least recently used entries first
+        entries.sort()
+
+        for _, manifest_path, object_path, entry_size in entries:
+            if size <= self.max_size:
+                break
+
+            for path in (manifest_path, object_path):
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+
+            size -= entry_size
+
+    def report(self):
+        """Return a brief summary of the cache statistics of the current build."""
+        lookups = self.hits + self.misses
+        rate = 100 * self.hits / lookups if lookups else 0
+
+        return (
+            f"Object cache: {self.hits} hits ({self.remote_hits} remote), {self.misses} misses ({rate:.1f}% hit rate)"
+        )
+
+    def close(self):
+        """Finish sharing entries with the remote backend, if any."""
+        if self.remote is not None:
+            self.remote.close()
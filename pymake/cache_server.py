@@ -0,0 +1,134 @@
+"""
+Reference server sharing object cache entries via HTTP GET and PUT requests.
+
+Run it via `python3 -m pymake.cache_server` and pass its URL to `pymake.py --remote-cache`.
+"""
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+#   Argparse
+import argparse
+#   HTTP
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+#   OS
+import os
+#   Pathlib
+from pathlib import Path
+#   RE
+import re
+#   Threading
+import threading
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# Matches valid entry file names, which keeps requests from escaping the cache directory
+_entry_name_pattern = re.compile(r"^/([0-9a-f]{2})[0-9a-f]*\.(?:json|o)$")
+
+
+# =============================================================================
+# >> CACHE REQUEST HANDLER TYPE DEFINITION
+# =============================================================================
+class CacheRequestHandler(BaseHTTPRequestHandler):
+    """Class used to serve entry files from and store them in a directory."""
+
+    # The directory holding the entry files
+    directory = None
+
+    # Whether to log each request
+    verbose = False
+
+    def entry_path(self):
+        """Return the path of the requested entry file, or None if the request path isn't valid."""
+        match = _entry_name_pattern.match(self.path)
+
+        if match is None:
+            return None
+
+        return self.directory.joinpath(match.group(1), self.path[1:])
+
+    def do_GET(self):
+        """Send the requested entry file."""
+        path = self.entry_path()
+
+        if path is None:
+            self.send_error(HTTPStatus.BAD_REQUEST)
+            return
+
+        try:
+            data = path.read_bytes()
+        except OSError:
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_PUT(self):
+        """Store the sent entry file."""
+        path = self.entry_path()
+
+        if path is None:
+            self.send_error(HTTPStatus.BAD_REQUEST)
+            return
+
+        data = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+        # Write to a temporary file first, so simultaneous requests never see incomplete entry files
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        temp_path.write_bytes(data)
+        os.replace(temp_path, path)
+
+        self.send_response(HTTPStatus.CREATED)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        """Only log requests if verbose."""
+        if self.verbose:
+            super().log_message(format, *args)
+
+
+# =============================================================================
+# >> SERVER FUNCTIONS
+# =============================================================================
+def create_server(directory, host="127.0.0.1", port=8080, verbose=False):
+    """Return a `ThreadingHTTPServer` instance serving entry files of the given directory."""
+    handler = type("CacheRequestHandler", (CacheRequestHandler,), {
+        "directory": Path(directory),
+        "verbose": verbose
+    })
+
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main(args=None):
+    """Run the server until interrupted."""
+    parser = argparse.ArgumentParser(prog="pymake.cache_server", description=__doc__.strip().splitlines()[0])
+
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=8080, help="port to listen on (default: %(default)s)")
+    parser.add_argument("--directory", type=Path, default=Path("pymake-cache"), help="directory to store entry files in (default: %(default)s)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log each request")
+
+    arguments = parser.parse_args(args)
+
+    with create_server(arguments.directory, arguments.host, arguments.port, arguments.verbose) as server:
+        print(f"Serving object cache entries from {arguments.directory} on http://{arguments.host}:{server.server_port}")
+
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
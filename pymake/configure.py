@@ -0,0 +1,88 @@
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+#   Hashlib
+import hashlib
+#   OS
+import os
+#   Pathlib
+from pathlib import Path
+#   Pickle
+import pickle
+
+# PyMake Imports
+#   Utils
+from pymake.utils import recursive_mkdir
+
+
+# =============================================================================
+# >> CONFIGURE CACHE TYPE DEFINITION
+# =============================================================================
+class ConfigureCache(object):
+    """Class used to store a configured project, reused while nothing it has been configured from changed."""
+
+    # Bumped whenever the pickled project data changes shape
+    version = 3
+
+    def __init__(self, path, key):
+        """C'tor."""
+        # Store the path of the cache file
+        self.path = Path(path)
+
+        # Store the digest of everything read to configure the project
+        self.key = key
+
+    @staticmethod
+    def digest(files):
+        """Return a digest of the content of the given files, the executable search path and the cache version."""
+        digest = hashlib.blake2b(str(ConfigureCache.version).encode(), digest_size=20)
+
+        for path in files:
+            try:
+                digest.update(Path(path).read_bytes())
+            except OSError:
+                digest.update(b"\0missing\0")
+
+        digest.update(os.environ.get("PATH", "").encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def stamps(paths):
+        """Return a dict holding the mtime of each given path, or None if it doesn't exist."""
+        stamps = dict()
+
+        for path in paths:
+            try:
+                stamps[path] = os.stat(path).st_mtime_ns
+            except OSError:
+                stamps[path] = None
+
+        return stamps
+
+    def load(self):
+        """Return the cached project data, or None if anything it has been configured from changed."""
+        try:
+            with self.path.open("rb") as cache_fp:
+                key, stamps, project_data = pickle.load(cache_fp)
+        except Exception:
+            # Missing, corrupt or written by an incompatible version
+            return None
+
+        if key != self.key or ConfigureCache.stamps(stamps) != stamps:
+            return None
+
+        return project_data
+
+    def save(self, project_data, paths):
+        """Store the project data along with the mtimes of paths whose changes require reconfiguring."""
+        # Make sure the cache file path exists
+        recursive_mkdir(self.path.as_posix().split(os.sep))
+
+        # Write to a temporary file first, so an interrupted run can't leave a corrupt cache file behind
+        temp_path = self.path.with_name(f"{self.path.name}.tmp")
+
+        with temp_path.open("wb") as cache_fp:
+            pickle.dump((self.key, ConfigureCache.stamps(paths), project_data), cache_fp, pickle.HIGHEST_PROTOCOL)
+
+        os.replace(temp_path, self.path)
@@ -0,0 +1,136 @@
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+#   Contextlib
+from contextlib import redirect_stderr
+from contextlib import redirect_stdout
+#   JSON
+import json
+#   OS
+import os
+#   Pathlib
+from pathlib import Path
+#   Socket
+import socket
+#   Socketserver
+import socketserver
+#   Traceback
+import traceback
+
+# PyMake Imports
+#   Utils
+from pymake.utils import recursive_mkdir
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# The socket path relative to the directory holding 'pymake.yml', also known to 'pymake_client.py'
+socket_path = Path(".pymake", "daemon.sock")
+
+
+# =============================================================================
+# >> DAEMON OUTPUT TYPE DEFINITION
+# =============================================================================
+class DaemonOutput(object):
+    """Class used as a text stream sending everything written to it to the client as output messages."""
+
+    def __init__(self, wfile):
+        """C'tor."""
+        # Store the binary stream of the client connection
+        self.wfile = wfile
+
+    def write(self, text):
+        """Send text to the client."""
+        if text:
+            self.wfile.write(f"{json.dumps({'output': text})}\n".encode())
+
+        return len(text)
+
+    def flush(self):
+        """Nothing to flush, as messages are sent right away."""
+
+
+# =============================================================================
+# >> DAEMON REQUEST HANDLER TYPE DEFINITION
+# =============================================================================
+class DaemonRequestHandler(socketserver.StreamRequestHandler):
+    """Class used to run a single build request of a client, streaming the build output back."""
+
+    # Send messages right away
+    wbufsize = 0
+
+    def handle(self):
+        """Read the request, build and send the exit code."""
+        try:
+            request = json.loads(self.rfile.readline())
+        except ValueError:
+            return
+
+        output = DaemonOutput(self.wfile)
+
+        try:
+            if request.get("stop"):
+                self.server.running = False
+                exit_code = 0
+            else:
+                # Everything printed while building goes to the client
+                with redirect_stdout(output), redirect_stderr(output):
+                    try:
+                        exit_code = self.server.build(request.get("args", []))
+                    except SystemExit as error:
+                        exit_code = error.code if isinstance(error.code, int) else 1
+                    except Exception:
+                        traceback.print_exc()
+                        exit_code = 1
+
+            self.wfile.write(f"{json.dumps({'exit_code': exit_code})}\n".encode())
+        except OSError:
+            # The client went away
+            pass
+
+
+# =============================================================================
+# >> BUILD DAEMON TYPE DEFINITION
+# =============================================================================
+class BuildDaemon(socketserver.UnixStreamServer):
+    """Class used to serve build requests on a Unix socket, one at a time, via a long-running process."""
+
+    def __init__(self, build):
+        """C'tor."""
+        # Store the callable building the project from command line arguments and returning the exit code
+        self.build = build
+
+        # Whether to keep serving requests
+        self.running = True
+
+        # Make sure the socket path exists and isn't taken by a dead daemon
+        recursive_mkdir(socket_path.as_posix().split(os.sep))
+
+        if BuildDaemon.is_running():
+            raise OSError(f"A daemon is already listening on {socket_path}!")
+
+        socket_path.unlink(missing_ok=True)
+
+        super().__init__(socket_path.as_posix(), DaemonRequestHandler)
+
+    @staticmethod
+    def is_running():
+        """Return whether a daemon is listening on the socket."""
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            try:
+                client.connect(socket_path.as_posix())
+            except OSError:
+                return False
+
+        return True
+
+    def serve(self):
+        """Serve requests until a client asks the daemon to stop."""
+        try:
+            while self.running:
+                self.handle_request()
+        finally:
+            self.server_close()
+            socket_path.unlink(missing_ok=True)
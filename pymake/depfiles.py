@@ -0,0 +1,52 @@
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+#   RE
+import re
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# Matches a single prerequisite, which may contain escaped characters like spaces
+_prerequisite_pattern = re.compile(r"(?:\\.|[^\s\\])+")
+
+# Matches escape sequences within a prerequisite
+_escape_pattern = re.compile(r"\\([ #\\])")
+
+
+# =============================================================================
+# >> DEPFILE FUNCTIONS
+# =============================================================================
+def parse_depfile_text(text):
+    """Return a tuple of prerequisites from Makefile-format depfile text, in order and without duplicates."""
+    # Join continued lines
+    text = text.replace("\\\r\n", " ").replace("\\\n", " ")
+
+    prerequisites = dict()
+
+    for rule in text.splitlines():
+        # Split the targets from the prerequisites. The separator is followed by whitespace,
+        # which tells it apart from drive letters of Windows paths.
+        _, separator, rule_prerequisites = rule.partition(": ")
+
+        if not separator:
+            continue
+
+        # Fast path: nothing is escaped
+        if "\\" not in rule_prerequisites and "$" not in rule_prerequisites:
+            prerequisites.update(dict.fromkeys(rule_prerequisites.split()))
+            continue
+
+        for prerequisite in _prerequisite_pattern.findall(rule_prerequisites):
+            prerequisite = _escape_pattern.sub(r"\1", prerequisite).replace("$$", "$")
+            prerequisites[prerequisite] = None
+
+    return tuple(prerequisites)
+
+
+def parse_depfile(path):
+    """Return a tuple of prerequisites from the given Makefile-format depfile."""
+    with open(path) as depfile_fp:
+        return parse_depfile_text(depfile_fp.read())
@@ -0,0 +1,83 @@
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+#   Concurrent
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+#   Heapq
+import heapq
+#   Time
+import time
+
+# PyMake Imports
+#   Jobs
+from pymake.jobs import JobResult
+
+
+# =============================================================================
+# >> EXECUTOR TYPE DEFINITION
+# =============================================================================
+class Executor(object):
+    """Class used to run jobs on a bounded number of threads, each waiting on a compiler process."""
+
+    def __init__(self, processes, cache=None):
+        """C'tor."""
+        # Store the `ObjectCache` instance compile jobs may take their outputs from
+        self.cache = cache
+
+        # Threads only wait on child processes, so there's no need for worker processes
+        self.pool = ThreadPoolExecutor(max_workers=processes, thread_name_prefix="pymake")
+
+        # Futures of the jobs currently running
+        self.running = set()
+
+        # Free slots, so each running job is identified by the lowest slot not taken by another one
+        self.slots = list(range(processes))
+
+    def __enter__(self):
+        """Return the executor itself as context manager."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Shut the executor down when leaving the context."""
+        self.shutdown()
+
+    def __len__(self):
+        """Return the number of jobs currently running."""
+        return len(self.running)
+
+    def execute(self, job, slot):
+        """Run a single job in the given slot and return its `JobResult` instance."""
+        start_ns = time.perf_counter_ns()
+
+        try:
+            result = job.toolchain.run(job, self.cache)
+        except OSError as error:
+            result = JobResult(job=job, exit_code=-1, output=f"{error}\n".encode())
+
+        result.slot = slot
+        result.start_ns = start_ns
+        result.end_ns = time.perf_counter_ns()
+
+        return result
+
+    def submit(self, job):
+        """Start running a job in the lowest free slot."""
+        self.running.add(self.pool.submit(self.execute, job, heapq.heappop(self.slots)))
+
+    def wait(self):
+        """Wait for at least one running job to finish and return a list of `JobResult` instances."""
+        done, self.running = wait(self.running, return_when=FIRST_COMPLETED)
+        results = [future.result() for future in done]
+
+        for result in results:
+            heapq.heappush(self.slots, result.slot)
+
+        return results
+
+    def shutdown(self):
+        """Wait for running jobs to finish, drop pending ones and release the threads."""
+        self.pool.shutdown(wait=True, cancel_futures=True)
+        self.running.clear()
@@ -0,0 +1,228 @@
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+#   OS
+import os
+#   Pathlib
+from pathlib import Path
+
+# PyMake Imports
+#   Jobs
+from pymake.jobs import JobTypes
+#   Utils
+from pymake.utils import format_command
+from pymake.utils import format_response_file
+from pymake.utils import recursive_mkdir
+from pymake.utils import write_if_changed
+
+
+# =============================================================================
+# >> GENERATOR BASE TYPE DEFINITION
+# =============================================================================
+class GeneratorBase(object):
+    """Class used as a base for writing build files of other build systems from a configured project."""
+
+    # Static generator name
+    name = None
+
+    # Static build file name, written to the build dir
+    file_name = None
+
+    # A dict holding generator classes by name
+    instances = dict()
+
+    def __init__(self, project_data, regenerate_command, regenerate_inputs, link_jobs=None):
+        """C'tor."""
+        # Store the given `ProjectData` instance
+        self.project_data = project_data
+
+        # Store the arguments of the command running pymake to generate the build file again, and the paths requiring it
+        self.regenerate_command = regenerate_command
+        self.regenerate_inputs = regenerate_inputs
+
+        # Store the number of link jobs to run simultaneously, or None if not limited
+        self.link_jobs = link_jobs
+
+    @classmethod
+    def register(cls):
+        """Register the non-generic generator class by name."""
+        if cls.name is None:
+            raise ValueError(f"Cannot register generic generator {cls.__name__}!")
+
+        cls.instances[cls.name] = cls
+
+    @staticmethod
+    def create(name, project_data, regenerate_command, regenerate_inputs, link_jobs=None):
+        """Return a generator instance for the given generator name."""
+        if name not in GeneratorBase.instances:
+            raise ValueError(f"No generator found for {name}, choose from: {', '.join(GeneratorBase.instances)}")
+
+        return GeneratorBase.instances[name](project_data, regenerate_command, regenerate_inputs, link_jobs)
+
+    @property
+    def path(self):
+        """Return the path of the build file, i.e. '<build_dir>/<file_name>'."""
+        return self.project_data.build_dir.joinpath(self.file_name)
+
+    def jobs(self):
+        """Yield the jobs of all targets and toolchains, each after the jobs of its dependencies."""
+        for target in self.project_data.targets:
+            for toolchain in target.toolchains:
+                yield from toolchain.jobs(target)
+
+    def generate(self):
+        """Return the content of the build file."""
+        raise NotImplementedError(f"{type(self).__name__} has no clue how to generate a build file!")
+
+    def save(self):
+        """Write the build file, unless it's up to date, and return whether it was written."""
+        # Make sure the build file path exists
+        recursive_mkdir(self.path.as_posix().split(os.sep))
+
+        # Keep the mtime of an unchanged build file, so the build system doesn't consider it regenerated
+        return write_if_changed(self.path, self.generate())
+
+
+# =============================================================================
+# >> NINJA GENERATOR TYPE DEFINITION
+# =============================================================================
+class NinjaGenerator(GeneratorBase):
+    """Class used to write a 'build.ninja' file running the jobs of the project via ninja."""
+
+    name = "ninja"
+    file_name = "build.ninja"
+
+    # Console pools, `deps` and `rspfile` need this version
+    required_version = "1.5"
+
+    @staticmethod
+    def escape_path(path):
+        """Return a path escaped for use in build statements."""
+        path = Path(path).as_posix()
+
+        if "\n" in path:
+            raise ValueError(f"Cannot write path {path!r} to a ninja file!")
+
+        return path.replace("$", "$$").replace(" ", "$ ").replace(":", "$:")
+
+    @staticmethod
+    def escape_value(value):
+        """Return a string escaped for use as a variable value."""
+        if "\n" in value:
+            raise ValueError(f"Cannot write value {value!r} to a ninja file!")
+
+        return value.replace("$", "$$")
+
+    @staticmethod
+    def rule(name, command, description, **variables):
+        """Return the lines of a rule with the given variables."""
+        lines = [f"rule {name}", f"  command = {command}", f"  description = {description}"]
+        lines.extend(f"  {key} = {value}" for key, value in variables.items())
+
+        return lines
+
+    def build(self, outputs, rule, inputs=(), implicit_inputs=(), **variables):
+        """Return the lines of a build statement with the given variables, whose values are escaped."""
+        statement = f"build {' '.join(map(self.escape_path, outputs))}: {rule}"
+
+        if inputs:
+            statement += f" {' '.join(map(self.escape_path, inputs))}"
+
+        if implicit_inputs:
+            statement += f" | {' '.join(map(self.escape_path, implicit_inputs))}"
+
+        lines = [statement]
+        lines.extend(f"  {key} = {self.escape_value(value)}" for key, value in variables.items())
+
+        return lines
+
+    def job_lines(self, job):
+        """Return the lines of the build statement running a single job."""
+        # Rule variables take precedence over build variables of the same name, so the latter are prefixed
+        variables = dict()
+
+        # Pass the arguments via a response file written by ninja, if the command is too long
+        if job.toolchain.uses_response_file(job):
+            response_file = job.toolchain.response_file_path(job.output)
+            variables["job_command"] = format_command(
+                (job.command[0], *job.toolchain.response_file_strings(response_file))
+            )
+            variables["job_rspfile"] = response_file.as_posix()
+            variables["job_rspfile_content"] = format_response_file(job.command[1:], " ").rstrip()
+        else:
+            variables["job_command"] = job.command_line
+
+        if job.depfile is not None:
+            variables["job_depfile"] = job.depfile.as_posix()
+
+        return self.build((job.output,), job.job_type.name.lower(), job.inputs, **variables)
+
+    def generate(self):
+        """Return the content of the 'build.ninja' file."""
+        lines = [
+            f"# Generated by pymake for {self.project_data.name}, do not edit.",
+            f"ninja_required_version = {self.required_version}",
+            f"builddir = {self.escape_path(self.project_data.build_dir)}",
+            ""
+        ]
+
+        # Linking is the most memory-hungry job type, so link and archive jobs may be limited separately
+        link_pool = dict()
+
+        if self.link_jobs is not None:
+            lines.extend(("pool link_pool", f"  depth = {self.link_jobs}", ""))
+            link_pool["pool"] = "link_pool"
+
+        # Headers are discovered via the depfiles compilers write, which ninja keeps in its deps log
+        lines.extend(self.rule(
+            JobTypes.PRECOMPILE.name.lower(), "$job_command", "PRECOMPILE $out",
+            depfile="$job_depfile", deps="gcc", rspfile="$job_rspfile", rspfile_content="$job_rspfile_content"
+        ))
+        lines.append("")
+        lines.extend(self.rule(
+            JobTypes.COMPILE.name.lower(), "$job_command", "COMPILE $out",
+            depfile="$job_depfile", deps="gcc", rspfile="$job_rspfile", rspfile_content="$job_rspfile_content"
+        ))
+        lines.append("")
+        lines.extend(self.rule(
+            JobTypes.LINK.name.lower(), "$job_command", "LINK $out",
+            rspfile="$job_rspfile", rspfile_content="$job_rspfile_content", **link_pool
+        ))
+        lines.append("")
+
+        # Archivers add to existing archives, which would keep members of removed source files
+        lines.extend(self.rule(
+            JobTypes.ARCHIVE.name.lower(), "rm -f $out && $job_command", "ARCHIVE $out",
+            rspfile="$job_rspfile", rspfile_content="$job_rspfile_content", **link_pool
+        ))
+        lines.append("")
+
+        # Unchanged build files keep their mtime, which restat tells ninja to check
+        lines.extend(self.rule(
+            "regenerate", self.escape_value(format_command(self.regenerate_command)), "Regenerating $out",
+            generator="1", restat="1", pool="console"
+        ))
+        lines.append("")
+        lines.extend(self.build((self.path,), "regenerate", implicit_inputs=self.regenerate_inputs))
+        lines.append("")
+
+        # Outputs of each target by target name
+        outputs = dict()
+
+        for job in self.jobs():
+            lines.extend(self.job_lines(job))
+
+            if job.job_type in (JobTypes.LINK, JobTypes.ARCHIVE):
+                outputs.setdefault(job.target.name, list()).append(job.output)
+
+        lines.append("")
+
+        # Build single targets by name, or all of them by default
+        for name, target_outputs in outputs.items():
+            lines.extend(self.build((name,), "phony", target_outputs))
+
+        lines.extend(self.build(("all",), "phony", tuple(outputs)))
+        lines.extend(("", "default all", ""))
+
+        return "\n".join(lines)
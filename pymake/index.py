@@ -0,0 +1,190 @@
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+#   Fnmatch
+import fnmatch
+#   JSON
+import json
+#   OS
+import os
+#   Pathlib
+from pathlib import Path
+from pathlib import PurePosixPath
+#   RE
+import re
+
+# PyMake Imports
+#   Utils
+from pymake.utils import recursive_mkdir
+
+
+# =============================================================================
+# >> FILE INDEX TYPE DEFINITION
+# =============================================================================
+class FileIndex(object):
+    """Class used to hold the files below the source dir, walked once per configure and shared by all targets."""
+
+    # Names of directories never walked into, e.g. version control and PyMake directories
+    ignored_names = frozenset((".git", ".hg", ".svn", ".pymake", "__pycache__"))
+
+    def __init__(self, source_dir, path, ignored_dirs=(), directories=None):
+        """C'tor."""
+        # Store the source dir and the path of the index file
+        self.source_dir = Path(source_dir)
+        self.path = Path(path)
+
+        # Store the posix paths of directories never walked into, relative to the source dir
+        self.ignored_dirs = frozenset(ignored_dirs)
+
+        # A dict holding `[mtime_ns, files, subdirs]` by posix directory path relative to the source dir,
+        # with the source dir itself being ''. Entries are taken from the previous run until updated.
+        self.directories = dict() if directories is None else directories
+
+        # Whether the index needs to be written back to the index file
+        self.modified = False
+
+        # Lazily created sets of file names by directory
+        self.file_sets = dict()
+
+    def __contains__(self, relative_path):
+        """Return whether the index holds the given posix file path relative to the source dir."""
+        directory, _, name = relative_path.rpartition("/")
+
+        try:
+            return name in self.file_sets[directory]
+        except KeyError:
+            pass
+
+        entry = self.directories.get(directory)
+
+        if entry is None:
+            return False
+
+        file_set = self.file_sets[directory] = frozenset(entry[1])
+        return name in file_set
+
+    def scan(self, relative_dir, path):
+        """Return the file and subdirectory names inside a directory."""
+        files = list()
+        subdirs = list()
+
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    # Ignore version control and build directories
+                    if entry.name in self.ignored_names:
+                        continue
+
+                    if f"{relative_dir}/{entry.name}".lstrip("/") in self.ignored_dirs:
+                        continue
+
+                    subdirs.append(entry.name)
+                else:
+                    files.append(entry.name)
+
+        return sorted(files), sorted(subdirs)
+
+    def update(self):
+        """Walk the source dir, re-scanning only directories changed since the previous run."""
+        previous = self.directories
+        self.directories = dict()
+        self.file_sets.clear()
+
+        pending = [""]
+
+        while pending:
+            relative_dir = pending.pop()
+            path = self.source_dir.joinpath(relative_dir).as_posix()
+
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+            except OSError:
+                self.modified = True
+                continue
+
+            entry = previous.get(relative_dir)
+
+            # A directory's mtime changes whenever an entry is added, removed or renamed
+            if entry is None or entry[0] != mtime_ns:
+                entry = [mtime_ns, *self.scan(relative_dir, path)]
+                self.modified = True
+
+            self.directories[relative_dir] = entry
+
+            pending.extend(
+                f"{relative_dir}/{subdir}".lstrip("/") for subdir in entry[2]
+            )
+
+        # Directories removed since the previous run
+        if previous.keys() - self.directories.keys():
+            self.modified = True
+
+    def match(self, pattern):
+        """Return a sorted list of source file paths matching a glob pattern at any depth, like `Path.rglob`."""
+        pattern_parts = PurePosixPath(pattern).parts
+
+        # Leave unusual patterns to `Path.rglob`
+        if not pattern_parts or "**" in pattern_parts or ".." in pattern_parts or pattern_parts[0] == "/":
+            return sorted(path for path in self.source_dir.rglob(pattern) if path.is_file())
+
+        name_pattern = re.compile(fnmatch.translate(pattern_parts[-1]))
+        dir_patterns = [re.compile(fnmatch.translate(part)) for part in pattern_parts[:-1]]
+
+        matches = list()
+
+        for relative_dir, (_, files, _) in self.directories.items():
+            dir_parts = relative_dir.split("/") if relative_dir else []
+
+            # The trailing parts of the directory have to match the directory parts of the pattern
+            if len(dir_parts) < len(dir_patterns):
+                continue
+
+            if dir_patterns and not all(
+                dir_pattern.match(dir_part) for dir_pattern, dir_part in zip(dir_patterns, dir_parts[-len(dir_patterns):])
+            ):
+                continue
+
+            matches.extend(
+                self.source_dir.joinpath(relative_dir, name) for name in files if name_pattern.match(name)
+            )
+
+        return sorted(matches)
+
+    def save(self):
+        """Write the index to the index file, if it changed."""
+        if not self.modified:
+            return
+
+        # Make sure the index file path exists
+        recursive_mkdir(self.path.as_posix().split(os.sep))
+
+        # Write to a temporary file first, so an interrupted run can't leave a corrupt index file behind
+        temp_path = self.path.with_name(f"{self.path.name}.tmp")
+
+        with temp_path.open("w") as index_fp:
+            json.dump({
+                "source_dir": self.source_dir.as_posix(),
+                "ignored_dirs": sorted(self.ignored_dirs),
+                "directories": self.directories
+            }, index_fp, separators=(",", ":"))
+
+        os.replace(temp_path, self.path)
+        self.modified = False
+
+    @staticmethod
+    def load(source_dir, path, ignored_dirs=()):
+        """Return a `FileIndex` instance holding the directories of the given index file, if it matches."""
+        file_index = FileIndex(source_dir, path, ignored_dirs)
+
+        try:
+            with file_index.path.open() as index_fp:
+                data = json.load(index_fp)
+        except (OSError, ValueError):
+            return file_index
+
+        # Entries of a different source dir or with different ignore rules can't be reused
+        if data["source_dir"] == file_index.source_dir.as_posix() and set(data["ignored_dirs"]) == file_index.ignored_dirs:
+            file_index.directories = data["directories"]
+
+        return file_index
@@ -0,0 +1,90 @@
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+#   Dataclasses
+from dataclasses import dataclass
+#   Enum
+from enum import IntEnum
+#   Pathlib
+from pathlib import Path
+
+# PyMake Imports
+#   Utils
+from pymake.utils import format_command
+
+
+# =============================================================================
+# >> JOB TYPES DEFINITION
+# =============================================================================
+class JobTypes(IntEnum):
+    """Enum used to hold valid job types."""
+
+    COMPILE = 0
+    LINK = 1
+    ARCHIVE = 2
+    PRECOMPILE = 3
+
+
+# =============================================================================
+# >> JOB DATA TYPE DEFINITION
+# =============================================================================
+@dataclass(slots=True, eq=False)
+class JobData(object):
+    """Class used to hold read-only data of a single toolchain job."""
+
+    job_type: JobTypes
+    target: object
+    toolchain: object
+    command: tuple
+    output: Path
+    inputs: tuple
+    depfile: Path = None
+    cache_key: str = None
+
+    def __repr__(self):
+        """Brief object representation."""
+        return f"<{self.job_type.name.lower()}: [{self.output.as_posix()}] via [{self.toolchain.name}]>"
+
+    @property
+    def command_line(self):
+        """Return the command as a shell-quoted string for logging."""
+        return format_command(self.command)
+
+
+# =============================================================================
+# >> JOB RESULT TYPE DEFINITION
+# =============================================================================
+@dataclass(slots=True, eq=False)
+class JobResult(object):
+    """Class used to hold the read-only result of a finished job."""
+
+    job: JobData
+    exit_code: int
+    output: bytes = b""
+    inputs: tuple = ()
+    cache_hit: bool = False
+
+    # The CPU time in seconds and peak RSS in bytes of the command, if it has been run, or 0 if unknown
+    cpu_time: float = 0.0
+    max_rss: int = 0
+
+    # The executor slot the job ran in and its `time.perf_counter_ns` start and end times
+    slot: int = 0
+    start_ns: int = 0
+    end_ns: int = 0
+
+    @property
+    def success(self):
+        """Return whether the job succeeded."""
+        return self.exit_code == 0
+
+    @property
+    def output_text(self):
+        """Return the captured job output as text."""
+        return self.output.decode(errors="replace")
+
+    @property
+    def duration(self):
+        """Return the wall-clock time the job took in seconds."""
+        return (self.end_ns - self.start_ns) / 1e9
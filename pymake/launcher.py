@@ -0,0 +1,160 @@
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+#   Concurrent
+from concurrent.futures import Future
+#   Itertools
+import itertools
+#   JSON
+import json
+#   OS
+import os
+#   Subprocess
+import subprocess
+#   Sys
+import sys
+#   Threading
+import threading
+
+# This module is also run as a script by `JobLauncher`, so it must not import any other PyMake module
+
+
+# =============================================================================
+# >> LAUNCHER FUNCTIONS
+# =============================================================================
+def execute(arguments):
+    """Run a command and return its exit code, its combined output, its CPU time in seconds and its peak RSS in bytes."""
+    with subprocess.Popen(arguments, stdout=subprocess.PIPE, stderr=subprocess.STDOUT) as process:
+        output = process.stdout.read()
+
+        # Reap the child via `os.wait4`, which also reports its resource usage
+        if not hasattr(os, "wait4"):
+            return process.wait(), output, 0.0, 0
+
+        _, status, usage = os.wait4(process.pid, 0)
+        process.returncode = os.waitstatus_to_exitcode(status)
+
+    # `ru_maxrss` is given in kilobytes on Linux
+    return process.returncode, output, usage.ru_utime + usage.ru_stime, usage.ru_maxrss << 10
+
+
+def serve():
+    """Run the commands requested via stdin simultaneously, writing their results to stdout, until stdin is closed."""
+    lock = threading.Lock()
+
+    def run(request):
+        try:
+            exit_code, output, cpu_time, max_rss = execute(request["args"])
+
+            # Output is passed as a Latin-1 string, which maps each byte to a single character
+            response = {
+                "id": request["id"], "exit_code": exit_code, "output": output.decode("latin-1"),
+                "cpu_time": cpu_time, "max_rss": max_rss
+            }
+        except OSError as error:
+            response = {"id": request["id"], "error": str(error)}
+
+        with lock:
+            sys.stdout.buffer.write(f"{json.dumps(response)}\n".encode())
+            sys.stdout.buffer.flush()
+
+    for line in sys.stdin.buffer:
+        threading.Thread(target=run, args=(json.loads(line),), daemon=True).start()
+
+
+# =============================================================================
+# >> JOB LAUNCHER TYPE DEFINITION
+# =============================================================================
+class JobLauncher(object):
+    """Class used to run commands via a small helper process, so their peak RSS isn't inflated by PyMake's own."""
+
+    # Linux carries the peak RSS of a process over to the program it executes, so commands started by PyMake
+    # would never report less than PyMake's own peak RSS. Commands started by the helper report at least
+    # the helper's peak RSS, i.e. the floor measured by running `true`, so values up to it are unknown.
+
+    # The running instance, started on first use, or False if it can't be started
+    instance = None
+
+    # Serializes starting the instance, as jobs are run from executor threads
+    lock = threading.Lock()
+
+    def __init__(self):
+        """C'tor."""
+        # Keep the helper from importing site packages, so it stays as small as possible
+        self.process = subprocess.Popen(
+            (sys.executable, "-S", "-E", os.path.abspath(__file__)), stdin=subprocess.PIPE, stdout=subprocess.PIPE
+        )
+
+        # Futures of requested commands by request id
+        self.pending = dict()
+        self.ids = itertools.count()
+        self.pending_lock = threading.Lock()
+
+        self.reader = threading.Thread(target=self.read, name="pymake-launcher", daemon=True)
+        self.reader.start()
+
+        # The peak RSS reported for a command using next to no memory
+        self.floor = 0
+        self.floor = self.execute(("true",))[3]
+
+    @staticmethod
+    def get():
+        """Return the running `JobLauncher` instance, starting it if necessary, or None if it can't be started."""
+        with JobLauncher.lock:
+            if JobLauncher.instance is None or (JobLauncher.instance and JobLauncher.instance.process.poll() is not None):
+                try:
+                    JobLauncher.instance = JobLauncher()
+                except OSError as error:
+                    print(f"[WARN] Could not start the job launcher: {error}. Peak RSS of jobs will be inaccurate...")
+                    JobLauncher.instance = False
+
+            return JobLauncher.instance or None
+
+    def read(self):
+        """Resolve the futures of requested commands as their results arrive."""
+        for line in self.process.stdout:
+            response = json.loads(line)
+
+            with self.pending_lock:
+                future = self.pending.pop(response["id"])
+
+            if "error" in response:
+                future.set_exception(OSError(response["error"]))
+                continue
+
+            # Peak RSS values up to the floor can't be told apart from it, so they're unknown
+            max_rss = response["max_rss"] if response["max_rss"] > self.floor else 0
+
+            future.set_result(
+                (response["exit_code"], response["output"].encode("latin-1"), response["cpu_time"], max_rss)
+            )
+
+        # The helper exited, so no further results will arrive
+        with self.pending_lock:
+            pending, self.pending = self.pending, dict()
+
+        for future in pending.values():
+            future.set_exception(OSError("The job launcher exited"))
+
+    def execute(self, arguments):
+        """Run a command via the helper and return the same as `execute`, but with a peak RSS of 0 if unknown."""
+        future = Future()
+
+        with self.pending_lock:
+            request_id = next(self.ids)
+            self.pending[request_id] = future
+
+            # Write while holding the lock, so requests of simultaneous jobs don't interleave
+            try:
+                self.process.stdin.write(f"{json.dumps({'id': request_id, 'args': list(arguments)})}\n".encode())
+                self.process.stdin.flush()
+            except OSError:
+                del self.pending[request_id]
+                raise
+
+        return future.result()
+
+
+if __name__ == "__main__":
+    serve()
@@ -14,6 +14,8 @@ from pymake.listeners.managers import _target_pre_configure_manager
 from pymake.listeners.managers import _target_post_configure_manager
 from pymake.listeners.managers import _target_pre_build_manager
 from pymake.listeners.managers import _target_post_build_manager
+#   Listeners: Managers / Jobs
+from pymake.listeners.managers import _jobs_post_build_manager
 
 
 # =============================================================================
@@ -65,3 +67,9 @@ class PostBuildTarget(ListenerBase):
     """Decorator class used to call a callback after building a target."""
 
     manager = _target_post_build_manager
+
+
+class PostBuildJobs(ListenerBase):
+    """Decorator class used to call a callback with a tuple of `JobResult` instances of jobs which have been run."""
+
+    manager = _jobs_post_build_manager
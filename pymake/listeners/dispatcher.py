@@ -0,0 +1,112 @@
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+#   Queue
+import queue
+#   Threading
+import threading
+#   Traceback
+import traceback
+
+# PyMake Imports
+#   Listeners
+from pymake.listeners.managers import ListenerManager
+
+
+# =============================================================================
+# >> LISTENER DISPATCHER TYPE DEFINITION
+# =============================================================================
+class ListenerDispatcher(object):
+    """Class used to deliver build events to listeners on a separate thread, so slow callbacks never stall job slots."""
+
+    # Events are delivered in the order they have been queued. `JobResult` instances are collected
+    # and delivered to `PostBuildJobs` listeners in batches, whenever the queue runs empty, the batch
+    # is full or another event has to be delivered.
+
+    # The maximum number of `JobResult` instances delivered at once
+    batch_size = 256
+
+    def __init__(self):
+        """C'tor."""
+        # Queued events, i.e. `(callback, args)` tuples or `JobResult` instances, ended by None
+        self.events = queue.Queue()
+
+        # `JobResult` instances not yet delivered
+        self.results = list()
+
+        # The first exception raised by a callback, raised again when closing the dispatcher
+        self.error = None
+
+        self.thread = threading.Thread(target=self.run, name="pymake-listeners", daemon=True)
+
+    def __enter__(self):
+        """Start delivering events and return the dispatcher itself as context manager."""
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        """Deliver the remaining events when leaving the context."""
+        self.close()
+
+    def deliver(self, callback, *args):
+        """Call a `ListenerManager` callback, keeping the first exception for the main thread."""
+        try:
+            callback(*args)
+        except Exception as error:
+            traceback.print_exc()
+
+            if self.error is None:
+                self.error = error
+
+    def flush(self):
+        """Deliver the collected `JobResult` instances to `PostBuildJobs` listeners."""
+        if self.results:
+            self.deliver(ListenerManager.post_build_jobs, tuple(self.results))
+            self.results.clear()
+
+    def run(self):
+        """Deliver queued events until None is queued."""
+        while True:
+            try:
+                event = self.events.get_nowait()
+            except queue.Empty:
+                # Nothing else to collect for now
+                self.flush()
+                event = self.events.get()
+
+            if event is None:
+                self.flush()
+                break
+
+            if isinstance(event, tuple):
+                # Keep the order of events
+                self.flush()
+                self.deliver(*event)
+                continue
+
+            self.results.append(event)
+
+            if len(self.results) >= self.batch_size:
+                self.flush()
+
+    def pre_build_target(self, target_data, toolchain):
+        """Queue a `PreBuildTarget` event."""
+        self.events.put((ListenerManager.pre_build_target, target_data, toolchain))
+
+    def post_build_target(self, target_data, toolchain):
+        """Queue a `PostBuildTarget` event."""
+        self.events.put((ListenerManager.post_build_target, target_data, toolchain))
+
+    def post_build_job(self, result):
+        """Queue the `JobResult` instance of a job which has been run, delivered along with others."""
+        self.events.put(result)
+
+    def close(self):
+        """Deliver the remaining events and raise the first exception raised by a callback, if any."""
+        if self.thread.is_alive():
+            self.events.put(None)
+            self.thread.join()
+
+        if self.error is not None:
+            raise self.error
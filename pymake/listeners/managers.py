@@ -12,6 +12,18 @@ class ListenerManager(list):
         for instance in manager:
             instance.callback(*args)
 
+    @staticmethod
+    def unregister_all():
+        """Unregister all listener decorator instances, e.g. before executing make.py again."""
+        for manager in (
+            _project_pre_configure_manager, _project_post_configure_manager,
+            _project_pre_build_manager, _project_post_build_manager,
+            _target_pre_configure_manager, _target_post_configure_manager,
+            _target_pre_build_manager, _target_post_build_manager,
+            _jobs_post_build_manager
+        ):
+            manager.clear()
+
     @staticmethod
     def pre_configure_project(source_dir, build_dir):
         """Call all `PreConfigureProject` instances with proper arguments."""
@@ -52,6 +64,11 @@ class ListenerManager(list):
         """Call all `PostConfigureTarget` instances with proper arguments."""
         ListenerManager.call(_target_post_build_manager, target_data, toolchain)
 
+    @staticmethod
+    def post_build_jobs(results):
+        """Call all `PostBuildJobs` instances with proper arguments."""
+        ListenerManager.call(_jobs_post_build_manager, results)
+
 
 # =============================================================================
 # >> LISTENER MANAGER DEFINITIONS
@@ -67,3 +84,6 @@ _target_pre_configure_manager = ListenerManager()
 _target_post_configure_manager = ListenerManager()
 _target_pre_build_manager = ListenerManager()
 _target_post_build_manager = ListenerManager()
+
+# Job managers
+_jobs_post_build_manager = ListenerManager()
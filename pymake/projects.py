@@ -6,18 +6,35 @@
 from dataclasses import dataclass
 #   Multiprocessing
 import multiprocessing
+#   OS
+import os
 #   PyYAML
 import yaml
 #   Pathlib
 from pathlib import Path
 
 # PyMake Imports
+#   Configure
+from pymake.configure import ConfigureCache
+#   Index
+from pymake.index import FileIndex
 #   Projects
 from pymake.listeners.managers import ListenerManager
+#   Scheduler
+from pymake.scheduler import Scheduler
 #   Targets
 from pymake.targets import TargetData
 #   Toolchains
 from pymake.toolchains import ToolchainData
+#   Trace
+from pymake.trace import span
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# Use the LibYAML based loader, if available
+_yaml_loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
 
 # =============================================================================
@@ -40,34 +57,35 @@ class ProjectData(object):
         """Brief object representation."""
         return f"<{self.name}> {self.description}\n in: {self.build_dir.resolve().as_posix()}"
 
-    def build(self):
+    def build(self, cache=None, trace=None, report=None):
         """Build the project sequentially."""
-        # Notify `PreBuildProject` listeners
-        ListenerManager.pre_build_project(self)
+        return self.build_parallel(1, cache, trace, report)
 
-        # Build the project
-        for target in self.targets:
-            for toolchain in target.toolchains:
-                target.build(toolchain)
-
-        # Notify `PostBuildProject` listeners
-        ListenerManager.post_build_project(self)
-
-    def build_parallel(self, processes=multiprocessing.cpu_count()):
-        """Build the project in parallel."""
+    def build_parallel(
+        self, processes=multiprocessing.cpu_count(), cache=None, trace=None, report=None, memory_budget=None, link_jobs=None
+    ):
+        """Build the project in parallel, running up to `processes` jobs, `link_jobs` of them linking, within `memory_budget` bytes."""
         # Notify `PreBuildProject` listeners
         ListenerManager.pre_build_project(self)
 
-        # Create a multiprocessing pool
-        pool = multiprocessing.Pool(processes)
+        # Schedule the jobs of all targets and toolchains as a single graph,
+        # adding targets after their dependencies
+        scheduler = Scheduler(processes, cache, trace, report, memory_budget, link_jobs)
+
+        with span(trace, "Schedule jobs", "build"):
+            for target in self.targets:
+                for toolchain in target.toolchains:
+                    scheduler.add(target, toolchain)
 
         # Build the project
-        for target in self.targets:
-            pool.map(target.build, target.toolchains)
+        with span(trace, "Run jobs", "build", processes=processes):
+            success = scheduler.run()
 
         # Notify `PostBuildProject` listeners
         ListenerManager.post_build_project(self)
 
+        return success
+
     @staticmethod
     def name_from_data(data):
         """Return the project name from the YAML data."""
@@ -93,6 +111,19 @@ class ProjectData(object):
         """Return the project build dir from the YAML data as a `Path` instance."""
         return Path(data["build_dir"])
 
+    @staticmethod
+    def load_file_index(source_dir, build_dir):
+        """Return the `FileIndex` instance of the source dir, holding the directories of the previous run."""
+        ignored_dirs = list()
+
+        # Never walk into the build dir
+        try:
+            ignored_dirs.append(build_dir.resolve().relative_to(source_dir.resolve()).as_posix())
+        except ValueError:
+            pass
+
+        return FileIndex.load(source_dir, build_dir.joinpath("pymake_index.json"), ignored_dirs)
+
     @staticmethod
     def toolchains_from_data(data):
         """Yield a `ToolchainData` instance for each toolchain from the YAML data."""
@@ -103,13 +134,56 @@ class ProjectData(object):
                 yield toolchain
 
     @staticmethod
-    def targets_from_data(build_dir, toolchains, source_dir, data):
-        """Yield a `TargetData` instance for each target from the YAML data."""
-        for name, target_data in data.items():
-            yield TargetData.create(build_dir, name, toolchains, source_dir, target_data)
+    def sorted_target_names_from_data(data):
+        """Return the target names from the YAML data, ordered so each target comes after its dependencies."""
+        sorted_names = list()
+
+        # The targets currently being visited, used to detect dependency cycles
+        visiting = list()
+        visited = set()
+
+        def visit(name):
+            if name in visited:
+                return
+
+            if name in visiting:
+                cycle = " -> ".join((*visiting[visiting.index(name):], name))
+                raise ValueError(f"Dependency cycle between targets: {cycle}")
+
+            visiting.append(name)
+
+            for dependency in TargetData.depends_on_from_data(data[name]):
+                if dependency not in data:
+                    raise KeyError(f"Target {name} depends on unknown target {dependency}!")
+
+                visit(dependency)
+
+            visiting.pop()
+            visited.add(name)
+            sorted_names.append(name)
+
+        for name in data:
+            visit(name)
+
+        return sorted_names
+
+    @staticmethod
+    def targets_from_data(build_dir, toolchains, file_index, data, trace=None):
+        """Yield a `TargetData` instance for each target from the YAML data, after those of its dependencies."""
+        targets = dict()
+
+        for name in ProjectData.sorted_target_names_from_data(data):
+            dependencies = tuple(
+                targets[dependency] for dependency in TargetData.depends_on_from_data(data[name])
+            )
+
+            with span(trace, f"Configure target {name}", target=name):
+                targets[name] = TargetData.create(build_dir, name, toolchains, file_index, data[name], dependencies)
+
+            yield targets[name]
 
     @staticmethod
-    def create(data):
+    def create(data, trace=None):
         """Return a `ProjectData` instance from the YAML data."""
         source_dir = ProjectData.source_dir_from_data(data)
         build_dir = ProjectData.build_dir_from_data(data)
@@ -117,7 +191,12 @@ class ProjectData(object):
         # Notify `PreConfigureProject` listeners
         ListenerManager.pre_configure_project(source_dir, build_dir)
 
-        toolchains = ProjectData.toolchains_from_data(data.get("toolchains", dict()))
+        toolchains = tuple(ProjectData.toolchains_from_data(data.get("toolchains", dict())))
+
+        # Walk the source dir once for all targets, reusing unchanged directories of the previous run
+        with span(trace, "Update file index"):
+            file_index = ProjectData.load_file_index(source_dir, build_dir)
+            file_index.update()
 
         project_data = ProjectData(
             name=ProjectData.name_from_data(data),
@@ -126,10 +205,13 @@ class ProjectData(object):
             source_dir=source_dir,
             build_dir=build_dir,
             targets=tuple(
-                ProjectData.targets_from_data(build_dir, toolchains, source_dir, data.get("targets", dict()))
+                ProjectData.targets_from_data(build_dir, toolchains, file_index, data.get("targets", dict()), trace)
             )
         )
 
+        with span(trace, "Save file index"):
+            file_index.save()
+
         for target in project_data.targets:
             if not target.toolchains:
                 raise ValueError(f"No toolchain found for target {target}! Exiting...")
@@ -139,9 +221,30 @@ class ProjectData(object):
 
         return project_data
 
+    def source_directories(self):
+        """Return the paths of all directories below the source dir, except the ignored ones."""
+        file_index = ProjectData.load_file_index(self.source_dir, self.build_dir)
+
+        return [self.source_dir.joinpath(relative_dir).as_posix() for relative_dir in file_index.directories]
+
+    def configure_paths(self):
+        """Return the paths whose modification requires configuring the project again."""
+        # Directories executables are searched in, since toolchains may be added to or removed from them
+        paths = [path for path in os.environ.get("PATH", "").split(os.pathsep) if path]
+
+        # Toolchain executables
+        paths.extend(dict.fromkeys(
+            toolchain.data.path.as_posix() for target in self.targets for toolchain in target.toolchains
+        ))
+
+        # Directories of the source dir, since glob patterns may match different files
+        paths.extend(self.source_directories())
+
+        return paths
+
     @staticmethod
-    def read(yaml_file):
-        """Read a YAML file and return a corresponding `ProjectData` instance."""
+    def read(yaml_file, make_py="make.py", reconfigure=False, trace=None):
+        """Read a YAML file and return a corresponding `ProjectData` instance, reusing the previous one if possible."""
         # Make sure we're dealing with a `Path` object
         yaml_file = Path(yaml_file)
 
@@ -149,8 +252,27 @@ class ProjectData(object):
         if not yaml_file.exists():
             raise FileNotFoundError(f"YAML file {yaml_file} could not be found.")
 
+        # The build dir is configured by the YAML file itself, so the cache is kept next to it
+        cache = ConfigureCache(
+            yaml_file.parent.joinpath(".pymake", "configure.cache"), ConfigureCache.digest((yaml_file, make_py))
+        )
+
+        # Reuse the previous `ProjectData` instance, if nothing it has been configured from changed
+        if not reconfigure:
+            with span(trace, "Load configure cache"):
+                project_data = cache.load()
+
+            if project_data is not None:
+                return project_data
+
         # Read the YAML file via PyYAML and return a `ProjectData` instance.
-        with yaml_file.open() as data_fp:
-            project_data_yaml = yaml.load(data_fp, Loader=yaml.Loader)
+        with span(trace, "Parse YAML file"), yaml_file.open() as data_fp:
+            project_data_yaml = yaml.load(data_fp, Loader=_yaml_loader)
+
+        with span(trace, "Configure project"):
+            project_data = ProjectData.create(project_data_yaml, trace)
 
-        return ProjectData.create(project_data_yaml)
+        with span(trace, "Save configure cache"):
+            cache.save(project_data, project_data.configure_paths())
+
+        return project_data
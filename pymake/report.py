@@ -0,0 +1,55 @@
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# PyMake Imports
+#   Jobs
+from pymake.jobs import JobTypes
+
+
+# =============================================================================
+# >> BUILD REPORT TYPE DEFINITION
+# =============================================================================
+class BuildReport(object):
+    """Class used to collect the resource usage of compiled translation units and summarize the heaviest ones."""
+
+    def __init__(self, count):
+        """C'tor."""
+        # Store the number of translation units listed per target and toolchain
+        self.count = count
+
+        # Lists of `JobResult` instances of compile jobs actually run, by target and toolchain name
+        self.results = dict()
+
+    def add(self, result):
+        """Add the `JobResult` instance of a finished job, if it compiled a translation unit."""
+        if result.job.job_type != JobTypes.COMPILE or result.cache_hit:
+            return
+
+        job = result.job
+        self.results.setdefault((job.target.name, job.toolchain.name), list()).append(result)
+
+    @staticmethod
+    def format_result(result):
+        """Return a single report line of a `JobResult` instance."""
+        # A peak RSS of 0 means it couldn't be measured
+        max_rss = f"{result.max_rss / (1 << 20):8.1f}" if result.max_rss else f"{'?':>8}"
+
+        return (
+            f"   {result.duration:8.2f}s wall {result.cpu_time:8.2f}s cpu {max_rss} MiB"
+            f"  {result.job.inputs[0].as_posix()}"
+        )
+
+    def summary(self):
+        """Return the slowest and most memory-hungry translation units of each target and toolchain as text."""
+        lines = list()
+
+        for (target, toolchain), results in sorted(self.results.items()):
+            lines.append(f"{target} via {toolchain}: {len(results)} translation units compiled")
+
+            lines.append("  Slowest:")
+            lines.extend(map(self.format_result, sorted(results, key=lambda result: -result.duration)[:self.count]))
+
+            lines.append("  Most memory:")
+            lines.extend(map(self.format_result, sorted(results, key=lambda result: -result.max_rss)[:self.count]))
+
+        return "\n".join(lines)
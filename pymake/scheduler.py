@@ -0,0 +1,369 @@
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+#   Heapq
+import heapq
+#   Itertools
+import itertools
+#   Time
+import time
+
+# PyMake Imports
+#   Executor
+from pymake.executor import Executor
+#   Listeners
+from pymake.listeners.dispatcher import ListenerDispatcher
+#   Jobs
+from pymake.jobs import JobTypes
+#   State
+from pymake.state import BuildState
+#   Stats
+from pymake.stats import JobStats
+
+
+# =============================================================================
+# >> SCHEDULER TYPE DEFINITION
+# =============================================================================
+class Scheduler(object):
+    """Class used to run the jobs of all targets and toolchains as a single dependency graph."""
+
+    def __init__(self, processes, cache=None, trace=None, report=None, memory_budget=None, link_jobs=None):
+        """C'tor."""
+        # Store the maximum number of jobs running simultaneously
+        self.processes = processes
+
+        # Store the number of bytes the peak RSS of simultaneously running jobs may add up to, if limited
+        self.memory_budget = memory_budget
+
+        # Store the maximum number of link and archive jobs running simultaneously within `processes`, if limited
+        self.link_jobs = link_jobs
+
+        # Store the `ObjectCache` instance to use, if any
+        self.cache = cache
+
+        # Store the `BuildTrace` instance recording each job, if any
+        self.trace = trace
+
+        # Store the `BuildReport` instance collecting the resource usage of each job, if any
+        self.report = report
+
+        # The number of unfinished dependencies of each job
+        self.dependencies = dict()
+
+        # The jobs waiting for each job to finish
+        self.dependents = dict()
+
+        # The jobs each job waits for
+        self.prerequisites = dict()
+
+        # The estimated time from starting each job until all jobs depending on it are finished, in seconds
+        self.priorities = dict()
+
+        # The `time.perf_counter_ns` time each job finished at
+        self.finish_times = dict()
+
+        # Keeps ready jobs of equal priority in the order they became ready
+        self.sequence = itertools.count()
+
+        # The jobs producing each output
+        self.producers = dict()
+
+        # The number of unfinished jobs of each target and toolchain
+        self.remaining = dict()
+
+        # The `ListenerDispatcher` instance delivering build events while running
+        self.dispatcher = None
+
+        # Loaded `BuildState` instances by state file path
+        self.states = dict()
+
+        # Loaded `JobStats` instances by stats file path
+        self.stats = dict()
+
+        # The estimated peak RSS of running jobs and the number of jobs running in the link pool
+        self.memory = 0
+        self.links = 0
+
+    def add(self, target_data, toolchain):
+        """Add the jobs of a target built via the given toolchain to the graph, after those of its dependencies."""
+        jobs = tuple(toolchain.jobs(target_data))
+
+        # The target is linked or archived as soon as the outputs of the targets it depends on are built via the same
+        # toolchain, while its other jobs may run alongside those of its dependencies
+        target_dependencies = {
+            self.producers[output_path] for output_path in (
+                toolchain.output_path(dependency) for dependency in target_data.dependencies
+            ) if output_path in self.producers
+        }
+
+        for job in jobs:
+            self.producers[job.output] = job
+
+        for job in jobs:
+            # A job depends on the jobs producing its inputs
+            dependencies = {
+                self.producers[input_file] for input_file in job.inputs if input_file in self.producers
+            }
+
+            if job.job_type in (JobTypes.LINK, JobTypes.ARCHIVE):
+                dependencies |= target_dependencies
+
+            self.dependencies[job] = len(dependencies)
+            self.dependents[job] = list()
+            self.prerequisites[job] = tuple(dependencies)
+
+            for dependency in dependencies:
+                self.dependents[dependency].append(job)
+
+        self.remaining[target_data.name, toolchain.name] = len(jobs)
+
+    def state(self, job):
+        """Return the `BuildState` instance responsible for the given job."""
+        state_path = job.toolchain.state_path(job.target)
+
+        try:
+            return self.states[state_path]
+        except KeyError:
+            state = self.states[state_path] = BuildState.load(state_path)
+            return state
+
+    def job_stats(self, job):
+        """Return the `JobStats` instance responsible for the given job."""
+        stats_path = job.toolchain.stats_path(job.target)
+
+        try:
+            return self.stats[stats_path]
+        except KeyError:
+            stats = self.stats[stats_path] = JobStats.load(stats_path)
+            return stats
+
+    def input_size(self, job):
+        """Return the total size of the job's existing inputs in bytes, or of its source file if it compiles one."""
+        state = self.state(job)
+
+        # Other inputs of compile jobs are precompiled headers, which would dwarf the source files they speed up
+        inputs = job.inputs[:1] if job.job_type in (JobTypes.COMPILE, JobTypes.PRECOMPILE) else job.inputs
+
+        return sum(stamp[1] for stamp in map(state.stamp, (input_file.as_posix() for input_file in inputs)) if stamp)
+
+    def prioritize(self):
+        """Compute the estimated remaining critical path length of each job from the durations of previous runs."""
+        # Visit jobs after all of their dependents
+        pending = {job: len(dependents) for job, dependents in self.dependents.items()}
+        order = [job for job, count in pending.items() if not count]
+
+        for job in order:
+            for dependency in self.prerequisites[job]:
+                pending[dependency] -= 1
+
+                if not pending[dependency]:
+                    order.append(dependency)
+
+        for job in order:
+            self.priorities[job] = self.job_stats(job).duration(job, self.input_size(job)) + max(
+                (self.priorities[dependent] for dependent in self.dependents[job]), default=0.0
+            )
+
+    def push(self, ready, job):
+        """Add a job to the ready queue of its pool, ordered by descending remaining critical path length."""
+        heapq.heappush(ready[self.in_link_pool(job)], (-self.priorities[job], next(self.sequence), job))
+
+    def in_link_pool(self, job):
+        """Return whether the job counts towards the limit of link jobs."""
+        return self.link_jobs is not None and job.job_type in (JobTypes.LINK, JobTypes.ARCHIVE)
+
+    def admits(self, job, executor):
+        """Return whether the job may start next to the running ones without exceeding the link pool or memory budget."""
+        if self.in_link_pool(job) and self.links >= self.link_jobs:
+            return False
+
+        # Never wait on an idle executor, even if a job alone exceeds the budget
+        if not executor:
+            return True
+
+        if self.memory_budget is not None and self.memory + self.job_stats(job).max_rss(job) > self.memory_budget:
+            return False
+
+        return True
+
+    def next_job(self, ready, executor):
+        """Remove and return the most critical ready job admitted next to the running ones, or return None if none is."""
+        # Only the most critical job of each pool is considered, so one refused by the memory budget holds back the
+        # rest of its pool until running jobs finish, rather than having every ready job checked against it
+        heaps = [heap for heap in ready if heap and self.admits(heap[0][-1], executor)]
+
+        if not heaps:
+            return None
+
+        return heapq.heappop(min(heaps, key=lambda heap: heap[0]))[-1]
+
+    def submit(self, job, executor):
+        """Start running a job, accounting for its estimated peak RSS and link pool slot."""
+        if self.memory_budget is not None:
+            self.memory += self.job_stats(job).max_rss(job)
+
+        if self.in_link_pool(job):
+            self.links += 1
+
+        executor.submit(job)
+
+    def release(self, job):
+        """Give the estimated peak RSS and link pool slot of a finished job back."""
+        if self.memory_budget is not None:
+            self.memory -= self.job_stats(job).max_rss(job)
+
+        if self.in_link_pool(job):
+            self.links -= 1
+
+    def finish(self, job, ready):
+        """Mark a job as finished, making its dependents ready once all of their dependencies are finished."""
+        self.finish_times[job] = time.perf_counter_ns()
+
+        for dependent in self.dependents[job]:
+            self.dependencies[dependent] -= 1
+
+            if not self.dependencies[dependent]:
+                self.push(ready, dependent)
+
+        group = job.target.name, job.toolchain.name
+        self.remaining[group] -= 1
+
+        # Notify `PostBuildTarget` listeners once every job of the target has finished
+        if not self.remaining[group]:
+            self.dispatcher.post_build_target(job.target, job.toolchain)
+
+    def run(self):
+        """Run all jobs of the graph and return whether all of them succeeded."""
+        # Start the jobs heading the longest chains first
+        self.prioritize()
+
+        # Ready jobs of other types and of the link pool, each heap ordered by descending critical path length
+        ready = (list(), list())
+
+        for job, dependencies in self.dependencies.items():
+            if not dependencies:
+                self.push(ready, job)
+
+        started = set()
+        failed = list()
+
+        # The wall-clock time each job took, being 0 for up-to-date jobs
+        durations = dict()
+
+        try:
+            with (
+                Executor(self.processes, self.cache) as executor,
+                ListenerDispatcher() as self.dispatcher
+            ):
+                while True:
+                    # Keep every slot busy, as far as memory and link pool allow, unless a job failed
+                    while any(ready) and len(executor) < self.processes and not failed:
+                        job = self.next_job(ready, executor)
+
+                        if job is None:
+                            break
+
+                        group = job.target.name, job.toolchain.name
+
+                        # Notify `PreBuildTarget` listeners before the first job of the target
+                        if group not in started:
+                            started.add(group)
+                            self.dispatcher.pre_build_target(job.target, job.toolchain)
+
+                        if self.state(job).is_up_to_date(job):
+                            durations[job] = 0.0
+                            self.finish(job, ready)
+                            continue
+
+                        self.submit(job, executor)
+
+                    if not executor:
+                        break
+
+                    # Wait for any job to finish
+                    for result in executor.wait():
+                        job = result.job
+                        print(result.output_text, end="")
+
+                        # Give the estimate back before recording the actual peak RSS, which may differ
+                        self.release(job)
+
+                        if self.trace is not None:
+                            self.trace.job(result, self.cache)
+
+                        if self.report is not None:
+                            self.report.add(result)
+
+                        self.dispatcher.post_build_job(result)
+
+                        if not result.success:
+                            print(f"[ERROR] {job} failed: {result.exit_code}")
+                            failed.append(job)
+                            continue
+
+                        durations[job] = result.duration
+
+                        self.state(job).record(job, result.inputs)
+                        self.job_stats(job).record(result, self.input_size(job))
+                        self.finish(job, ready)
+        finally:
+            for state in self.states.values():
+                state.save()
+
+            for stats in self.stats.values():
+                stats.save()
+
+            if self.cache is not None:
+                self.cache.trim()
+                self.cache.close()
+
+                if self.cache.hits or self.cache.misses:
+                    print(f"[INFO] {self.cache.report()}")
+
+            if self.report is not None and self.report.results:
+                print(f"[INFO] Resource usage of compiled translation units:\n{self.report.summary()}")
+
+            # Only worth mentioning if anything has been built
+            if any(durations.values()):
+                print(f"[INFO] Estimated critical path: {self.format_path(self.estimated_path(), self.priorities)}")
+                print(f"[INFO] Actual critical path: {self.format_path(self.actual_path(), durations)}")
+
+        return not failed
+
+    def estimated_path(self):
+        """Return the chain of jobs with the longest estimated duration."""
+        path = list()
+        jobs = [job for job, prerequisites in self.prerequisites.items() if not prerequisites]
+
+        while jobs:
+            job = max(jobs, key=self.priorities.__getitem__)
+            path.append(job)
+            jobs = self.dependents[job]
+
+        return path
+
+    def actual_path(self):
+        """Return the chain of finished jobs which the last finished job waited for the longest."""
+        path = list()
+        jobs = list(self.finish_times)
+
+        while jobs:
+            job = max(jobs, key=self.finish_times.__getitem__)
+            path.append(job)
+            jobs = [prerequisite for prerequisite in self.prerequisites[job] if prerequisite in self.finish_times]
+
+        return path[::-1]
+
+    def format_path(self, path, durations):
+        """Return a chain of jobs and its total duration as text."""
+        if not path:
+            return "none"
+
+        # Priorities already sum up the durations of their chain
+        if durations is self.priorities:
+            total = durations[path[0]]
+        else:
+            total = sum(durations.get(job, 0.0) for job in path)
+
+        return f"{total:.2f}s via {' -> '.join(job.output.name for job in path)}"
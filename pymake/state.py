@@ -0,0 +1,197 @@
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+#   JSON
+import json
+#   OS
+import os
+#   Pathlib
+from pathlib import Path
+
+# PyMake Imports
+#   Utils
+from pymake.utils import file_digest
+from pymake.utils import recursive_mkdir
+
+
+# =============================================================================
+# >> BUILD STATE TYPE DEFINITION
+# =============================================================================
+class BuildState(dict):
+    """Dict class used to persist the build records of job outputs between runs."""
+
+    # Records are keyed by output path and hold the command the output was built with,
+    # as well as a `[mtime_ns, size, digest]` stamp for each input file
+
+    # A dict holding loaded instances by path, kept between builds by long-running processes, or None
+    loaded = None
+
+    def __init__(self, path, records=()):
+        """C'tor."""
+        super().__init__(records)
+
+        # Store the path of the state file
+        self.path = Path(path)
+
+        # Whether records need to be written back to the state file
+        self.modified = False
+
+        # Stat and digest results of the current run, so shared inputs are looked at only once
+        self.stamps = dict()
+        self.digests = dict()
+
+        # The mtime of the state file when it has been read or written, used to notice other processes writing it
+        self.mtime_ns = None
+
+    def stamp(self, path):
+        """Return the `(mtime_ns, size)` stamp of a file or None if it doesn't exist."""
+        try:
+            return self.stamps[path]
+        except KeyError:
+            pass
+
+        try:
+            stat_result = os.stat(path)
+        except OSError:
+            stamp = None
+        else:
+            stamp = (stat_result.st_mtime_ns, stat_result.st_size)
+
+        self.stamps[path] = stamp
+        return stamp
+
+    def digest(self, path):
+        """Return the content digest of a file."""
+        try:
+            return self.digests[path]
+        except KeyError:
+            digest = self.digests[path] = file_digest(path)
+            return digest
+
+    def forget(self, path):
+        """Forget the stamp and digest of a file which has just been (re)written."""
+        self.stamps.pop(path, None)
+        self.digests.pop(path, None)
+
+    def is_up_to_date(self, job):
+        """Return whether the job output is up to date with its inputs and command."""
+        record = self.get(job.output.as_posix())
+
+        # Rebuild if the output has never been built or with a different command
+        if record is None or record["command"] != list(job.command):
+            return False
+
+        # Rebuild if the output is missing
+        if self.stamp(job.output.as_posix()) is None:
+            return False
+
+        inputs = record["inputs"]
+
+        # Rebuild if the job has inputs the output wasn't built from
+        if any(input_file.as_posix() not in inputs for input_file in job.inputs):
+            return False
+
+        for input_file, (mtime_ns, size, digest) in inputs.items():
+            stamp = self.stamp(input_file)
+
+            # Rebuild if an input has been removed or resized
+            if stamp is None or stamp[1] != size:
+                return False
+
+            if stamp[0] == mtime_ns:
+                continue
+
+            # The input has been touched, so only rebuild if its content actually changed
+            if self.digest(input_file) != digest:
+                return False
+
+            # Refresh the stamp, so the input won't be hashed again next time
+            inputs[input_file] = [stamp[0], size, digest]
+            self.modified = True
+
+        return True
+
+    def record(self, job, inputs=None):
+        """Record that the job output has been built from the given inputs (defaults to the job inputs)."""
+        output = job.output.as_posix()
+
+        # The output has just been written
+        self.forget(output)
+
+        record_inputs = dict()
+
+        for input_file in (job.inputs if inputs is None else inputs):
+            input_file = Path(input_file).as_posix()
+            stamp = self.stamp(input_file)
+
+            # Drop the record if an input vanished while building, so the next run rebuilds
+            if stamp is None:
+                self.pop(output, None)
+                self.modified = True
+                return
+
+            record_inputs[input_file] = [*stamp, self.digest(input_file)]
+
+        self[output] = {
+            "command": list(job.command),
+            "inputs": record_inputs
+        }
+
+        self.modified = True
+
+    def file_stamp(self):
+        """Return the mtime of the state file, or None if it doesn't exist."""
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def refresh(self):
+        """Forget the stat and digest results of the previous run."""
+        self.stamps.clear()
+        self.digests.clear()
+
+    def save(self):
+        """Write the records to the state file, if they changed."""
+        if not self.modified:
+            return
+
+        # Make sure the state file path exists
+        recursive_mkdir(self.path.as_posix().split(os.sep))
+
+        # Write to a temporary file first, so an interrupted run can't leave a corrupt state file behind
+        temp_path = self.path.with_name(f"{self.path.name}.tmp")
+
+        with temp_path.open("w") as state_fp:
+            json.dump(self, state_fp, separators=(",", ":"))
+
+        os.replace(temp_path, self.path)
+        self.modified = False
+        self.mtime_ns = self.file_stamp()
+
+    @staticmethod
+    def load(path):
+        """Return a `BuildState` instance from the given state file, or an empty one if it can't be read."""
+        path = Path(path)
+
+        # Reuse the instance of a previous build, unless another process wrote the state file since
+        if BuildState.loaded is not None:
+            state = BuildState.loaded.get(path)
+
+            if state is not None and state.file_stamp() == state.mtime_ns:
+                state.refresh()
+                return state
+
+        try:
+            with path.open() as state_fp:
+                state = BuildState(path, json.load(state_fp))
+        except (OSError, ValueError):
+            state = BuildState(path)
+
+        state.mtime_ns = state.file_stamp()
+
+        if BuildState.loaded is not None:
+            BuildState.loaded[path] = state
+
+        return state
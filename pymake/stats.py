@@ -0,0 +1,162 @@
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+#   JSON
+import json
+#   OS
+import os
+#   Pathlib
+from pathlib import Path
+
+# PyMake Imports
+#   Utils
+from pymake.utils import recursive_mkdir
+
+
+# =============================================================================
+# >> JOB STATS TYPE DEFINITION
+# =============================================================================
+class JobStats(dict):
+    """Dict class used to persist the resource usage of job outputs between runs, used to schedule later builds."""
+
+    # Records are keyed by output path and hold the job type, as well as the total input size in bytes,
+    # the peak RSS in bytes, or 0 if unknown, and the wall-clock time in seconds of the last run
+
+    # Seconds per input byte assumed for jobs which never ran, unless jobs of the same type have been recorded
+    seconds_per_byte = 1e-5
+
+    # A dict holding loaded instances by path, kept between builds by long-running processes, or None
+    loaded = None
+
+    def __init__(self, path, records=()):
+        """C'tor."""
+        super().__init__(records)
+
+        # Store the path of the stats file
+        self.path = Path(path)
+
+        # Whether records need to be written back to the stats file
+        self.modified = False
+
+        # Mean peak RSS and seconds per input byte of recorded jobs by job type, computed on first use
+        self.typical_rss = None
+        self.typical_rates = None
+
+        # The mtime of the stats file when it has been read or written, used to notice other processes writing it
+        self.mtime_ns = None
+
+    def max_rss(self, job):
+        """Return the peak RSS of the job's last run, or the mean of recorded jobs of the same type if it's unknown."""
+        record = self.get(job.output.as_posix())
+
+        if record is not None and record["max_rss"]:
+            return record["max_rss"]
+
+        if self.typical_rss is None:
+            totals = dict()
+
+            # A peak RSS of 0 means it couldn't be measured
+            for record in self.values():
+                if not record["max_rss"]:
+                    continue
+
+                total = totals.setdefault(record["type"], [0, 0])
+                total[0] += record["max_rss"]
+                total[1] += 1
+
+            self.typical_rss = {job_type: size // count for job_type, (size, count) in totals.items()}
+
+        return self.typical_rss.get(job.job_type.name.lower(), 0)
+
+    def duration(self, job, size):
+        """Return the wall-clock time of the job's last run, or estimate it from the given input size if it never ran."""
+        record = self.get(job.output.as_posix())
+
+        if record is not None:
+            return record["duration"]
+
+        if self.typical_rates is None:
+            totals = dict()
+
+            for record in self.values():
+                total = totals.setdefault(record["type"], [0.0, 0])
+                total[0] += record["duration"]
+                total[1] += record.get("size", 0)
+
+            self.typical_rates = {
+                job_type: duration / size for job_type, (duration, size) in totals.items() if size
+            }
+
+        return size * self.typical_rates.get(job.job_type.name.lower(), self.seconds_per_byte)
+
+    def record(self, result, size):
+        """Record the resource usage of a successfully run job with the given input size."""
+        # Outputs taken from the object cache say nothing about the resources needed to build them
+        if result.cache_hit:
+            return
+
+        self[result.job.output.as_posix()] = {
+            "type": result.job.job_type.name.lower(),
+            "size": size,
+            "max_rss": result.max_rss,
+            "duration": result.duration
+        }
+
+        self.modified = True
+
+    def file_stamp(self):
+        """Return the mtime of the stats file, or None if it doesn't exist."""
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def refresh(self):
+        """Forget the means computed during the previous run."""
+        self.typical_rss = None
+        self.typical_rates = None
+
+    def save(self):
+        """Write the records to the stats file, if they changed."""
+        if not self.modified:
+            return
+
+        # Make sure the stats file path exists
+        recursive_mkdir(self.path.as_posix().split(os.sep))
+
+        # Write to a temporary file first, so an interrupted run can't leave a corrupt stats file behind
+        temp_path = self.path.with_name(f"{self.path.name}.tmp")
+
+        with temp_path.open("w") as stats_fp:
+            json.dump(self, stats_fp, separators=(",", ":"))
+
+        os.replace(temp_path, self.path)
+        self.modified = False
+        self.mtime_ns = self.file_stamp()
+
+    @staticmethod
+    def load(path):
+        """Return a `JobStats` instance from the given stats file, or an empty one if it can't be read."""
+        path = Path(path)
+
+        # Reuse the instance of a previous build, unless another process wrote the stats file since
+        if JobStats.loaded is not None:
+            stats = JobStats.loaded.get(path)
+
+            if stats is not None and stats.file_stamp() == stats.mtime_ns:
+                stats.refresh()
+                return stats
+
+        try:
+            with path.open() as stats_fp:
+                stats = JobStats(path, json.load(stats_fp))
+        except (OSError, ValueError):
+            stats = JobStats(path)
+
+        stats.mtime_ns = stats.file_stamp()
+
+        if JobStats.loaded is not None:
+            JobStats.loaded[path] = stats
+
+        return stats
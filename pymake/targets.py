@@ -23,6 +23,8 @@ class OutputTypes(IntEnum):
     """Enum used to hold valid output types."""
 
     EXECUTABLE = 0
+    STATIC_LIBRARY = 1
+    SHARED_LIBRARY = 2
 
 
 # =============================================================================
@@ -38,11 +40,29 @@ class TargetData(object):
     output: str
     output_type: str
     toolchains: tuple
+    dependencies: tuple = ()
+    precompiled_header: Path = None
+    unity_batch_size: int = 0
 
     def __repr__(self):
         """Brief object representation."""
         return f"<{self.name}: [{self.build_dir.joinpath(self.output).as_posix()}] as [{self.output_type}]>"
 
+    @property
+    def is_static_library(self):
+        """Return whether the target output is a static library."""
+        return OutputTypes[self.output_type.upper()] == OutputTypes.STATIC_LIBRARY
+
+    @property
+    def is_shared_library(self):
+        """Return whether the target output is a shared library."""
+        return OutputTypes[self.output_type.upper()] == OutputTypes.SHARED_LIBRARY
+
+    @property
+    def is_library(self):
+        """Return whether the target output is a library other targets can link against."""
+        return self.is_static_library or self.is_shared_library
+
     def build(self, toolchain):
         """Build the target using the given toolchain."""
         # Notify `PreBuildTarget` listeners
@@ -55,27 +75,57 @@ class TargetData(object):
         ListenerManager.post_build_target(self, toolchain)
 
     @staticmethod
-    def source_files_from_data(source_dir, data):
-        """Return the culmination of source files from the YAML data."""
-        # Get a tuple of existing source files
-        existing = tuple(
-            filter(lambda source_file: source_dir.joinpath(source_file).exists(), map(Path, data))
-        )
+    def source_files_from_data(file_index, data):
+        """Return the culmination of source files from the YAML data, in order and without duplicates."""
+        source_files = dict()
 
-        # Get a set of glob patterns for source files to resolve
-        glob_patterns = set(data) - set(existing)
+        for entry in data:
+            # Take existing source files as they are
+            if entry in file_index:
+                source_files[file_index.source_dir.joinpath(entry)] = None
+                continue
 
-        # Generate resolved file names using recursive glob for each glob pattern
-        resolved = (
-            filename for pattern in glob_patterns for filename in source_dir.rglob(pattern)
-        )
+            # Resolve glob patterns against the file index, just like a recursive glob
+            # TODO: Raise an error if a file doesn't exist and couldn't be rglobbed
+            source_files.update(dict.fromkeys(file_index.match(entry)))
+
+        return tuple(source_files)
+
+    @staticmethod
+    def precompiled_header_from_data(file_index, data):
+        """Return the header to precompile for all source files of the target from the YAML data, if any."""
+        precompiled_header = data.get("precompiled_header")
+
+        if precompiled_header is None:
+            return None
+
+        # Raise an error if the header doesn't exist
+        if precompiled_header not in file_index:
+            raise FileNotFoundError(f"Precompiled header {precompiled_header} could not be found.")
 
-        # Return a tuple of all file names found
-        # TODO: Raise an error if a file doesn't exist and couldn't be rglobbed
-        return tuple({
-            *existing,
-            *resolved
-        })
+        return file_index.source_dir.joinpath(precompiled_header)
+
+    @staticmethod
+    def unity_batch_size_from_data(data):
+        """Return the number of source files compiled together in unity builds from the YAML data, or 0 if disabled."""
+        unity_batch_size = data.get("unity_batch_size", 0)
+
+        # Raise an error if the YAML batch size isn't valid
+        if not isinstance(unity_batch_size, int) or unity_batch_size < 0:
+            raise ValueError(f"{unity_batch_size} is not a valid unity batch size!")
+
+        return unity_batch_size
+
+    @staticmethod
+    def depends_on_from_data(data):
+        """Return a tuple of names of the targets this target depends on from the YAML data."""
+        depends_on = data.get("depends_on", tuple())
+
+        # Allow a single target name as well
+        if isinstance(depends_on, str):
+            return (depends_on,)
+
+        return tuple(depends_on)
 
     @staticmethod
     def output_from_data(data):
@@ -101,7 +151,7 @@ class TargetData(object):
         return output_type
 
     @staticmethod
-    def toolchains_from_data(toolchains_data):
+    def toolchains_from_data(toolchains_data, data):
         """Generate toolchains from the YAML data."""
         # Create a temporary toolchain lookup table
         toolchains_lookup = {
@@ -118,18 +168,22 @@ class TargetData(object):
         # Generate the global toolchain definitions
         global_definitions = () if global_toolchain is None else global_toolchain.definitions
 
-        # Yield new specific toolchain instances using the culmination of
-        # the global toolchain flags and definitions and target-specific ones
+        # Generate the target-specific flags and definitions
+        target_flags = ToolchainData.flags_from_data(data)
+        target_definitions = ToolchainData.definitions_from_data(data)
+
+        # Yield new specific toolchain instances using the culmination of the global,
+        # toolchain-specific and target-specific flags and definitions, in that order
         for toolchain in toolchains_lookup.values():
             yield ToolchainBase.instances[toolchain.name](ToolchainData(
                 name=toolchain.name,
                 path=toolchain.path,
-                flags=tuple({*global_flags, *toolchain.flags}),
-                definitions=tuple({*global_definitions, *toolchain.definitions})
+                flags=ToolchainData.merge_flags(global_flags, toolchain.flags, target_flags),
+                definitions=ToolchainData.merge_definitions(global_definitions, toolchain.definitions, target_definitions)
             ))
 
     @classmethod
-    def create(cls, build_dir, name, toolchains, source_dir, data):
+    def create(cls, build_dir, name, toolchains, file_index, data, dependencies=()):
         """Return a `TargetData` instance from the YAML data."""
         # Notify `PreConfigureTarget` listeners
         ListenerManager.pre_configure_target(name)
@@ -137,11 +191,14 @@ class TargetData(object):
         # Create a `TargetData` instance from the YAML data
         target_data = TargetData(
             name=name,
-            source_files=TargetData.source_files_from_data(source_dir, data["source_files"]),
+            source_files=TargetData.source_files_from_data(file_index, data["source_files"]),
             output=TargetData.output_from_data(data),
             output_type=TargetData.output_type_from_data(data),
             build_dir=build_dir,
-            toolchains=tuple(TargetData.toolchains_from_data(toolchains))
+            toolchains=tuple(TargetData.toolchains_from_data(toolchains, data)),
+            dependencies=dependencies,
+            precompiled_header=TargetData.precompiled_header_from_data(file_index, data),
+            unity_batch_size=TargetData.unity_batch_size_from_data(data)
         )
 
         # Notify `PostConfigureTarget` listeners
@@ -56,15 +56,34 @@ class ToolchainData(object):
         definitions: dict = data.get("definitions", dict())
 
         if not definitions:
-            return definitions
+            return tuple()
 
-        return [
+        return (
             *definitions.get("macros", list()),
-            *[
-                rf'{key}=\"{value}\"' if isinstance(value, str) else f"{key}={value}"
+            *(
+                f'{key}="{value}"' if isinstance(value, str) else f"{key}={value}"
                 for key, value in definitions.get("tokenized", dict()).items()
-            ]
-        ]
+            )
+        )
+
+    @staticmethod
+    def merge_flags(*layers):
+        """Return a tuple of flags from the given layers in order."""
+        # Flags aren't deduplicated, since some consist of multiple entries (e.g. '-Xlinker', '<option>').
+        # Compilers let later flags override earlier ones, so later layers take precedence.
+        return tuple(flag for layer in layers for flag in layer)
+
+    @staticmethod
+    def merge_definitions(*layers):
+        """Return a tuple of definitions from the given layers in order."""
+        # A definition of a macro already defined by a previous layer overrides it in place
+        definitions = dict()
+
+        for layer in layers:
+            for definition in layer:
+                definitions[definition.partition("=")[0]] = definition
+
+        return tuple(definitions.values())
 
     @staticmethod
     def create(name, data):
@@ -2,16 +2,32 @@
 # >> IMPORTS
 # =============================================================================
 # Python Imports
+#   Hashlib
+import hashlib
 #   OS
 import os
-#   Subprocess
-import subprocess
+#   Pathlib
+from pathlib import Path
 
 # PyMake Imports
+#   Depfiles
+from pymake.depfiles import parse_depfile
+#   Jobs
+from pymake.jobs import JobData
+from pymake.jobs import JobResult
+from pymake.jobs import JobTypes
+#   Launcher
+from pymake.launcher import JobLauncher
+from pymake.launcher import execute
+#   State
+from pymake.state import BuildState
 #   Toolchains
 from pymake.toolchains import ToolchainData
 #   Utils
+from pymake.utils import format_response_file
+from pymake.utils import format_unity_source
 from pymake.utils import recursive_mkdir
+from pymake.utils import write_if_changed
 
 
 # =============================================================================
@@ -26,6 +42,22 @@ class ToolchainBase(object):
     # A dict holding non-generic toolchain instances by name
     instances = dict()
 
+    # A dict holding compiler identities by executable path
+    identities = dict()
+
+    # The archiver executable used to create static libraries
+    archiver = None
+
+    # File name formats of library outputs
+    static_library_format = "{}"
+    shared_library_format = "{}"
+
+    # File name suffix of precompiled headers
+    precompiled_header_suffix = None
+
+    # Commands longer than this many bytes pass their arguments via a response file, or never if None
+    response_file_threshold = 32768
+
     def __init__(self, data: ToolchainData):
         """C'tor."""
         # Store the given `ToolchainData` object.
@@ -39,41 +71,405 @@ class ToolchainBase(object):
 
         cls.instances[cls.name] = cls
 
-    def build_command(self, target_data):
-        """Generate a build command for the target via this toolchain."""
-        # Join the source files to a string separated by whitespace
-        source_files_string = " ".join(
-            source_file.as_posix() for source_file in target_data.source_files
+    def output_path(self, target_data):
+        """Get the full output path for the given target, i.e. '<build_dir>/<toolchain>/<target_output>'."""
+        output_path = target_data.build_dir.joinpath(self.name).joinpath(target_data.output)
+
+        # Apply the library file name format of this toolchain
+        if target_data.is_static_library:
+            return output_path.with_name(self.static_library_format.format(output_path.name))
+
+        if target_data.is_shared_library:
+            return output_path.with_name(self.shared_library_format.format(output_path.name))
+
+        return output_path
+
+    def libraries(self, target_data):
+        """Return the library targets the target links against, each before the ones it depends on."""
+        visited = dict()
+
+        def visit(target):
+            for dependency in target.dependencies:
+                if dependency.name in visited or not dependency.is_library:
+                    continue
+
+                visited[dependency.name] = None
+
+                # Dependencies of shared libraries have already been linked into them
+                if dependency.is_static_library:
+                    visit(dependency)
+
+                libraries.append(dependency)
+
+        libraries = list()
+        visit(target_data)
+
+        # Static linking requires libraries to come before the libraries they depend on
+        return tuple(reversed(libraries))
+
+    def state_path(self, target_data):
+        """Get the build state file path for this toolchain, i.e. '<build_dir>/<toolchain>/pymake_state.json'."""
+        return target_data.build_dir.joinpath(self.name, "pymake_state.json")
+
+    def stats_path(self, target_data):
+        """Get the job stats file path for this toolchain, i.e. '<build_dir>/<toolchain>/pymake_stats.json'."""
+        return target_data.build_dir.joinpath(self.name, "pymake_stats.json")
+
+    def object_path(self, target_data, source_file):
+        """Get the object file path for a source file, i.e. '<build_dir>/<toolchain>/obj/<target>/<source_file>.o'."""
+        # Unity batch files are compiled into '<build_dir>/<toolchain>/obj/<target>/unity/<batch_file>.o'
+        if target_data.unity_batch_size and source_file.parent == self.unity_path(target_data):
+            source_file = Path("unity", source_file.name)
+
+        # Keep object files inside the object directory, even for absolute or parent-relative source files
+        parts = [
+            "__" if part == ".." else part for part in source_file.parts if part != source_file.anchor
+        ]
+
+        # Append the object file suffix to the source file name
+        parts[-1] = f"{parts[-1]}.o"
+
+        return target_data.build_dir.joinpath(self.name, "obj", target_data.name, *parts)
+
+    def precompiled_header_path(self, target_data):
+        """Get the precompiled header path of the target, i.e. '<build_dir>/<toolchain>/pch/<target>/<header><suffix>'."""
+        header_name = f"{target_data.precompiled_header.name}{self.precompiled_header_suffix}"
+        return target_data.build_dir.joinpath(self.name, "pch", target_data.name, header_name)
+
+    def unity_path(self, target_data):
+        """Get the directory holding the unity batch files of the target, i.e. '<build_dir>/<toolchain>/unity/<target>'."""
+        return target_data.build_dir.joinpath(self.name, "unity", target_data.name)
+
+    def unity_batches(self, target_data):
+        """Write the unity batch files of the target, unless they're up to date, and return their paths."""
+        unity_path = self.unity_path(target_data)
+        batch_size = target_data.unity_batch_size
+        batches = dict()
+
+        # Group source files by suffix, then split the sorted files before each one whose path hash is divisible by the
+        # batch size, so batches hold `unity_batch_size` files on average. Unlike chunks of a fixed size, adding or
+        # removing a file only changes its own batch, or merges or splits it with a neighbouring one.
+        for suffix in sorted({source_file.suffix for source_file in target_data.source_files}):
+            source_files = sorted(
+                source_file for source_file in target_data.source_files if source_file.suffix == suffix
+            )
+
+            batch = list()
+
+            for source_file in source_files:
+                digest = hashlib.blake2b(source_file.as_posix().encode(), digest_size=8).digest()
+                boundary = not int.from_bytes(digest, "big") % batch_size
+
+                # Also split runs of twice the batch size without a boundary, which only shifts batches up to the next one
+                if not batch or boundary or len(batch) >= 2 * batch_size:
+                    # Batches are named by the hash of their first file, so the others keep their names
+                    batch = batches[unity_path.joinpath(f"unity_{digest.hex()}{suffix}")] = list()
+
+                batch.append(source_file)
+
+        recursive_mkdir(unity_path.joinpath("_").as_posix().split(os.sep))
+
+        # Remove batch files left behind by a previous grouping, then write the current ones
+        for path in unity_path.iterdir():
+            if path not in batches:
+                path.unlink()
+
+        for batch_file, source_files in batches.items():
+            write_if_changed(batch_file, format_unity_source(batch_file, source_files))
+
+        return tuple(batches)
+
+    def depfile_path(self, object_file):
+        """Get the depfile path for an object file, i.e. the object file path with a '.d' suffix."""
+        return object_file.with_suffix(".d")
+
+    def response_file_path(self, output_path):
+        """Get the response file path for a job output, i.e. the output path with an additional '.rsp' suffix."""
+        return output_path.with_name(f"{output_path.name}.rsp")
+
+    def precompile_command(self, target_data):
+        """Generate the arguments of a command precompiling the header of the target via this toolchain."""
+        precompiled_header = self.precompiled_header_path(target_data)
+
+        # Use the exact definitions and flags of the compile commands, or the compiler will reject the precompiled header
+        return (
+            self.data.path.as_posix(),
+            *self.definitions(target_data),
+            *self.flags(target_data),
+            *self.position_independent_strings(target_data),
+            *self.precompile_strings(target_data.precompiled_header),
+            *self.depfile_strings(self.depfile_path(precompiled_header)),
+            *self.output_strings(precompiled_header)
         )
 
-        # Get the target output path
-        output_path = self.output_path(target_data)
+    def compile_command(self, target_data, source_file):
+        """Generate the arguments of a command compiling a single source file of the target via this toolchain."""
+        object_file = self.object_path(target_data, source_file)
 
-        # Make sure the output path exists
-        recursive_mkdir(output_path.as_posix().split(os.sep))
+        # Use the precompiled header of the target, if any
+        precompiled_header_strings = () if target_data.precompiled_header is None else (
+            self.precompiled_header_strings(self.precompiled_header_path(target_data))
+        )
 
-        # Compile the target via this toolchain
-        compile_cmd = [
+        return (
             self.data.path.as_posix(),
             *self.definitions(target_data),
             *self.flags(target_data),
-            source_files_string,
-            self.output_string(output_path)
-        ]
+            *self.position_independent_strings(target_data),
+            *precompiled_header_strings,
+            *self.compile_strings(source_file),
+            *self.depfile_strings(self.depfile_path(object_file)),
+            *self.output_strings(object_file)
+        )
+
+    def identity(self):
+        """Return a string identifying the compiler executable, changing whenever the compiler is replaced."""
+        path = self.data.path.as_posix()
+
+        try:
+            return self.identities[path]
+        except KeyError:
+            stat_result = os.stat(path)
+            identity = self.identities[path] = f"{path}:{stat_result.st_size}:{stat_result.st_mtime_ns}"
+            return identity
+
+    def cache_key(self, target_data, source_file):
+        """Return a key describing everything but file contents a compiled object file depends on."""
+        # Leave out the output, depfile and precompiled header paths, so objects can be shared across build directories.
+        # The precompiled header is accounted for by the headers it has been precompiled from, see `ObjectCache.source_inputs`.
+        return "\0".join((
+            self.identity(),
+            *self.definitions(target_data),
+            *self.flags(target_data),
+            *self.position_independent_strings(target_data),
+            *self.compile_strings(source_file)
+        ))
+
+    def link_command(self, target_data, object_files):
+        """Generate the arguments of a command linking the object files of the target via this toolchain."""
+        libraries = self.libraries(target_data)
+
+        # Make sure shared libraries are found at runtime
+        runtime_dirs = dict.fromkeys(
+            self.output_path(library).parent.resolve() for library in libraries if library.is_shared_library
+        )
+
+        return (
+            self.data.path.as_posix(),
+            *self.flags(target_data),
+            *self.shared_strings(target_data),
+            *(object_file.as_posix() for object_file in object_files),
+            *(self.output_path(library).as_posix() for library in libraries),
+            *(self.runtime_path_string(runtime_dir) for runtime_dir in runtime_dirs),
+            *self.output_strings(self.output_path(target_data))
+        )
+
+    def archive_command(self, target_data, object_files):
+        """Generate the arguments of a command archiving the object files of the target into a static library."""
+        return (
+            self.archiver,
+            *self.archive_strings(self.output_path(target_data)),
+            *(object_file.as_posix() for object_file in object_files)
+        )
+
+    def jobs(self, target_data):
+        """Yield a compile job for each source file of the target, followed by the link or archive job."""
+        object_files = list()
+
+        # Precompile the header of the target first, which all of its compile jobs take as an input
+        precompiled_headers = ()
+
+        if target_data.precompiled_header is not None:
+            precompiled_header = self.precompiled_header_path(target_data)
+            precompiled_headers = (precompiled_header,)
+
+            yield JobData(
+                job_type=JobTypes.PRECOMPILE,
+                target=target_data,
+                toolchain=self,
+                command=self.precompile_command(target_data),
+                output=precompiled_header,
+                inputs=(target_data.precompiled_header,),
+                depfile=self.depfile_path(precompiled_header)
+            )
+
+        # Compile batches of source files included by generated source files in unity builds
+        source_files = target_data.source_files
+
+        if target_data.unity_batch_size:
+            source_files = self.unity_batches(target_data)
+
+        for source_file in source_files:
+            object_file = self.object_path(target_data, source_file)
+            object_files.append(object_file)
+
+            yield JobData(
+                job_type=JobTypes.COMPILE,
+                target=target_data,
+                toolchain=self,
+                command=self.compile_command(target_data, source_file),
+                output=object_file,
+                inputs=(source_file, *precompiled_headers),
+                depfile=self.depfile_path(object_file),
+                cache_key=self.cache_key(target_data, source_file)
+            )
+
+        # Static libraries are archived rather than linked
+        if target_data.is_static_library:
+            yield JobData(
+                job_type=JobTypes.ARCHIVE,
+                target=target_data,
+                toolchain=self,
+                command=self.archive_command(target_data, object_files),
+                output=self.output_path(target_data),
+                inputs=tuple(object_files)
+            )
+
+            return
+
+        yield JobData(
+            job_type=JobTypes.LINK,
+            target=target_data,
+            toolchain=self,
+            command=self.link_command(target_data, object_files),
+            output=self.output_path(target_data),
+            inputs=(*object_files, *(self.output_path(library) for library in self.libraries(target_data)))
+        )
+
+    def prepare(self, job):
+        """Prepare the file system for running a single job of this toolchain."""
+        # Make sure the output path exists
+        recursive_mkdir(job.output.as_posix().split(os.sep))
+
+        # Start from scratch: archivers add to existing archives, which would keep members of removed
+        # source files, and compilers would write through hardlinks into the object cache
+        job.output.unlink(missing_ok=True)
+
+    def uses_response_file(self, job):
+        """Return whether the job's command is too long to pass its arguments other than via a response file."""
+        threshold = self.response_file_threshold
+
+        return threshold is not None and sum(len(os.fsencode(argument)) + 1 for argument in job.command) > threshold
+
+    def arguments(self, job):
+        """Return the arguments to run a job with, passing them via a response file if the command is too long."""
+        if not self.uses_response_file(job):
+            return job.command
+
+        # Only rewrite the response file if its content changed, so its mtime stays put between builds
+        response_file = self.response_file_path(job.output)
+        write_if_changed(response_file, format_response_file(job.command[1:]))
+
+        return job.command[0], *self.response_file_strings(response_file)
 
-        return " ".join(compile_cmd)
+    def run(self, job, cache=None):
+        """Run a single job of this toolchain, or take its output from the object cache, and return a `JobResult` instance."""
+        self.prepare(job)
+
+        # Try the object cache first
+        if cache is not None and job.cache_key is not None:
+            key = cache.key(job)
+            inputs = cache.lookup(job, key)
+
+            if inputs is not None:
+                return JobResult(job=job, exit_code=0, inputs=inputs, cache_hit=True)
+
+        # Run the command without a shell and capture the output, so output of simultaneous jobs doesn't interleave
+        exit_code, output, cpu_time, max_rss = self.execute(self.arguments(job))
+
+        if exit_code != 0:
+            return JobResult(job=job, exit_code=exit_code, output=output, cpu_time=cpu_time, max_rss=max_rss)
+
+        inputs = self.discovered_inputs(job)
+
+        if cache is not None and job.cache_key is not None:
+            cache.store(job, key, inputs)
+
+        return JobResult(job=job, exit_code=0, output=output, inputs=inputs, cpu_time=cpu_time, max_rss=max_rss)
+
+    @staticmethod
+    def execute(arguments):
+        """Run a command and return its exit code, its combined output, its CPU time in seconds and its peak RSS in bytes, or 0 if unknown."""
+        launcher = JobLauncher.get()
+
+        if launcher is not None:
+            return launcher.execute(arguments)
+
+        # Commands started by PyMake itself report at least PyMake's own peak RSS, so it's unknown
+        exit_code, output, cpu_time, _ = execute(arguments)
+        return exit_code, output, cpu_time, 0
+
+    def discovered_inputs(self, job):
+        """Return the inputs of a successfully run job, including headers listed in its depfile."""
+        if job.depfile is None:
+            return job.inputs
+
+        try:
+            return tuple(dict.fromkeys((*job.inputs, *map(Path, parse_depfile(job.depfile)))))
+        except OSError:
+            return job.inputs
 
     def build(self, target_data):
-        """Compile the target via this toolchain."""
-        subprocess.call(self.build_command(target_data), shell=True)
+        """Compile and link the target via this toolchain, skipping up-to-date outputs."""
+        state = BuildState.load(self.state_path(target_data))
 
-    def output_path(self, target_data):
-        """Get the full output path for the given target, i.e. '<build_dir>/<toolchain>/<target_output>'."""
-        return target_data.build_dir.joinpath(self.name).joinpath(target_data.output)
+        try:
+            for job in self.jobs(target_data):
+                if state.is_up_to_date(job):
+                    continue
+
+                result = self.run(job)
+                print(result.output_text, end="")
+
+                # Don't bother linking if a translation unit failed to compile
+                if not result.success:
+                    return False
+
+                state.record(job, result.inputs)
+        finally:
+            state.save()
+
+        return True
+
+    def output_strings(self, output_path):
+        """Return the toolchain strings used to set the output path."""
+        raise NotImplementedError(f"{type(self).__name__} has no clue how to format output strings!")
+
+    def compile_strings(self, source_file):
+        """Return the toolchain strings used to compile a source file without linking."""
+        raise NotImplementedError(f"{type(self).__name__} has no clue how to format compile strings!")
+
+    def precompile_strings(self, header_file):
+        """Return the toolchain strings used to precompile a header."""
+        raise NotImplementedError(f"{type(self).__name__} has no clue how to format precompile strings!")
+
+    def precompiled_header_strings(self, precompiled_header):
+        """Return the toolchain strings used to include a precompiled header into every compiled source file."""
+        raise NotImplementedError(f"{type(self).__name__} has no clue how to format precompiled header strings!")
+
+    def depfile_strings(self, depfile_path):
+        """Return the toolchain strings used to write a Makefile-format depfile while compiling."""
+        raise NotImplementedError(f"{type(self).__name__} has no clue how to format depfile strings!")
+
+    def archive_strings(self, output_path):
+        """Return the archiver strings used to create a static library."""
+        raise NotImplementedError(f"{type(self).__name__} has no clue how to format archive strings!")
+
+    def response_file_strings(self, response_file):
+        """Return the toolchain strings used to read further arguments from a response file."""
+        raise NotImplementedError(f"{type(self).__name__} has no clue how to format response file strings!")
+
+    def position_independent_strings(self, target_data):
+        """Return the toolchain strings used to compile position independent code for the target, if required."""
+        raise NotImplementedError(f"{type(self).__name__} has no clue how to format position independent code strings!")
+
+    def shared_strings(self, target_data):
+        """Return the toolchain strings used to link the target as a shared library, if required."""
+        raise NotImplementedError(f"{type(self).__name__} has no clue how to format shared library strings!")
 
-    def output_string(self, output_path):
-        """Return the toolchain output string."""
-        raise NotImplementedError(f"{type(self).__name__} has no clue how to format an output string!")
+    def runtime_path_string(self, runtime_dir):
+        """Return the toolchain string used to find shared libraries in the given directory at runtime."""
+        raise NotImplementedError(f"{type(self).__name__} has no clue how to format a runtime path string!")
 
     def flags(self, target_data):
         """Return formatted target flags for this toolchain."""
@@ -12,9 +12,58 @@ from pymake.toolchains.base import ToolchainBase
 class ClangToolchainFamily(ToolchainBase):
     """Class used to describe a toolchain of the Clang family."""
 
-    def output_string(self, output_path):
-        """Return the formatted output string."""
-        return f"-o {output_path}"
+    archiver = "ar"
+    static_library_format = "lib{}.a"
+    shared_library_format = "lib{}.so"
+    precompiled_header_suffix = ".pch"
+
+    # Language of headers to precompile
+    header_language = None
+
+    def compile_strings(self, source_file):
+        """Return the formatted compile strings."""
+        return "-c", source_file.as_posix()
+
+    def precompile_strings(self, header_file):
+        """Return the formatted precompile strings."""
+        return "-x", self.header_language, header_file.as_posix()
+
+    def precompiled_header_strings(self, precompiled_header):
+        """Return the formatted precompiled header strings."""
+        return "-include-pch", precompiled_header.as_posix()
+
+    def depfile_strings(self, depfile_path):
+        """Return the formatted depfile strings."""
+        return "-MD", "-MF", depfile_path.as_posix()
+
+    def output_strings(self, output_path):
+        """Return the formatted output strings."""
+        return "-o", output_path.as_posix()
+
+    def archive_strings(self, output_path):
+        """Return the formatted archive strings."""
+        return "rcs", output_path.as_posix()
+
+    def response_file_strings(self, response_file):
+        """Return the formatted response file strings, also understood by `ar`."""
+        return (f"@{response_file.as_posix()}",)
+
+    def position_independent_strings(self, target_data):
+        """Return the formatted position independent code strings, if required."""
+        # Static libraries may be linked into shared libraries depending on them, directly or transitively
+        return ("-fPIC",) if target_data.is_library else ()
+
+    def shared_strings(self, target_data):
+        """Return the formatted shared library strings, if required."""
+        if not target_data.is_shared_library:
+            return ()
+
+        # Dependents record the SONAME rather than the path they're linked with, so the loader searches the runtime path
+        return "-shared", f"-Wl,-soname,{self.output_path(target_data).name}"
+
+    def runtime_path_string(self, runtime_dir):
+        """Return the formatted runtime path string."""
+        return f"-Wl,-rpath,{runtime_dir}"
 
     def flags(self, target_data):
         """Return formatted target flags for this toolchain."""
@@ -34,9 +83,11 @@ class ClangToolchainC(ClangToolchainFamily):
     """Class used to describe the Clang toolchain for the C language."""
 
     name = "clang"
+    header_language = "c-header"
 
 
 class ClangToolchainCXX(ClangToolchainFamily):
     """Class used to describe the Clang toolchain for the C++ language."""
 
     name = "clang++"
+    header_language = "c++-header"
@@ -12,9 +12,59 @@ from pymake.toolchains.base import ToolchainBase
 class GccToolchainFamily(ToolchainBase):
     """Class used to describe a toolchain of the GCC family."""
 
-    def output_string(self, output_path):
-        """Return the formatted output string."""
-        return f"-o {output_path}"
+    archiver = "ar"
+    static_library_format = "lib{}.a"
+    shared_library_format = "lib{}.so"
+    precompiled_header_suffix = ".gch"
+
+    # Language of headers to precompile
+    header_language = None
+
+    def compile_strings(self, source_file):
+        """Return the formatted compile strings."""
+        return "-c", source_file.as_posix()
+
+    def precompile_strings(self, header_file):
+        """Return the formatted precompile strings."""
+        return "-x", self.header_language, header_file.as_posix()
+
+    def precompiled_header_strings(self, precompiled_header):
+        """Return the formatted precompiled header strings."""
+        # GCC looks for '<header>.gch' when including '<header>'
+        return "-Winvalid-pch", "-include", precompiled_header.with_suffix("").as_posix()
+
+    def depfile_strings(self, depfile_path):
+        """Return the formatted depfile strings."""
+        return "-MD", "-MF", depfile_path.as_posix()
+
+    def output_strings(self, output_path):
+        """Return the formatted output strings."""
+        return "-o", output_path.as_posix()
+
+    def archive_strings(self, output_path):
+        """Return the formatted archive strings."""
+        return "rcs", output_path.as_posix()
+
+    def response_file_strings(self, response_file):
+        """Return the formatted response file strings, also understood by `ar`."""
+        return (f"@{response_file.as_posix()}",)
+
+    def position_independent_strings(self, target_data):
+        """Return the formatted position independent code strings, if required."""
+        # Static libraries may be linked into shared libraries depending on them, directly or transitively
+        return ("-fPIC",) if target_data.is_library else ()
+
+    def shared_strings(self, target_data):
+        """Return the formatted shared library strings, if required."""
+        if not target_data.is_shared_library:
+            return ()
+
+        # Dependents record the SONAME rather than the path they're linked with, so the loader searches the runtime path
+        return "-shared", f"-Wl,-soname,{self.output_path(target_data).name}"
+
+    def runtime_path_string(self, runtime_dir):
+        """Return the formatted runtime path string."""
+        return f"-Wl,-rpath,{runtime_dir}"
 
     def flags(self, target_data):
         """Return formatted target flags for this toolchain."""
@@ -23,7 +73,8 @@ class GccToolchainFamily(ToolchainBase):
     def definitions(self, target_data):
         """Yield formatted target definitions for this toolchain."""
         for definition in self.from_target_data(target_data).data.definitions:
-            yield f"-D {definition}"
+            yield "-D"
+            yield definition
 
 
 # =============================================================================
@@ -33,9 +84,11 @@ class GccToolchainC(GccToolchainFamily):
     """Class used to describe the GCC toolchain for the C language."""
 
     name = "gcc"
+    header_language = "c-header"
 
 
 class GccToolchainCXX(GccToolchainFamily):
     """Class used to describe the GCC toolchain for the C++ language."""
 
     name = "g++"
+    header_language = "c++-header"
@@ -0,0 +1,144 @@
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+#   Contextlib
+from contextlib import contextmanager
+from contextlib import nullcontext
+#   JSON
+import json
+#   OS
+import os
+#   Resource
+try:
+    import resource
+except ImportError:
+    # Not available on Windows
+    resource = None
+#   Threading
+import threading
+#   Time
+import time
+
+# PyMake Imports
+#   Utils
+from pymake.utils import recursive_mkdir
+
+
+# =============================================================================
+# >> BUILD TRACE TYPE DEFINITION
+# =============================================================================
+class BuildTrace(object):
+    """Class used to record configure steps and jobs as Chrome trace events, viewable in Perfetto or 'chrome://tracing'."""
+
+    # Configure steps and the scheduler run on track 0, jobs on track `slot + 1` of the worker slot running them
+
+    def __init__(self):
+        """C'tor."""
+        # Timestamps are relative to the creation of the trace
+        self.origin = time.perf_counter_ns()
+
+        # The recorded trace events
+        self.events = list()
+
+        # The names of the recorded tracks by track id
+        self.tracks = {0: "pymake"}
+
+        # Events may be recorded from executor threads
+        self.lock = threading.Lock()
+
+    def timestamp(self, time_ns):
+        """Return a `time.perf_counter_ns` value in microseconds since the creation of the trace."""
+        return (time_ns - self.origin) / 1000
+
+    def complete(self, name, category, start_ns, end_ns, track=0, args=None):
+        """Record a complete event spanning the given `time.perf_counter_ns` values."""
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": self.timestamp(start_ns),
+            "dur": (end_ns - start_ns) / 1000,
+            "pid": os.getpid(),
+            "tid": track
+        }
+
+        if args:
+            event["args"] = args
+
+        with self.lock:
+            self.events.append(event)
+
+    @contextmanager
+    def span(self, name, category="configure", **args):
+        """Record a complete event spanning the body of the `with` statement."""
+        start_ns = time.perf_counter_ns()
+
+        try:
+            yield
+        finally:
+            self.complete(name, category, start_ns, time.perf_counter_ns(), args=args)
+
+    def job(self, result, cache=None):
+        """Record the run of a job from its `JobResult` instance."""
+        job = result.job
+
+        args = {
+            "target": job.target.name,
+            "toolchain": job.toolchain.name,
+            "output": job.output.as_posix(),
+            "exit_code": result.exit_code,
+            "cpu_time": result.cpu_time,
+            "max_rss": result.max_rss
+        }
+
+        # Only compile jobs are looked up in the object cache
+        if cache is not None and job.cache_key is not None:
+            args["cache"] = "hit" if result.cache_hit else "miss"
+
+        track = result.slot + 1
+        self.tracks.setdefault(track, f"worker {result.slot}")
+
+        self.complete(
+            job.output.name, job.job_type.name.lower(), result.start_ns, result.end_ns, track, args
+        )
+
+    def save(self, path):
+        """Write the recorded events to a Chrome trace JSON file."""
+        # Name the tracks, ordered by track id
+        metadata = list()
+
+        for track, name in sorted(self.tracks.items()):
+            metadata.append(
+                {"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": track, "args": {"name": name}}
+            )
+            metadata.append(
+                {"name": "thread_sort_index", "ph": "M", "pid": os.getpid(), "tid": track, "args": {"sort_index": track}}
+            )
+
+        # Make sure the trace file path exists
+        recursive_mkdir(path.as_posix().split(os.sep))
+
+        # The peak RSS of PyMake itself, without the jobs it ran. `ru_maxrss` is given in kilobytes on Linux.
+        other_data = dict()
+
+        if resource is not None:
+            other_data["max_rss"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss << 10
+
+        with path.open("w") as trace_fp:
+            json.dump({
+                "traceEvents": [*metadata, *self.events],
+                "displayTimeUnit": "ms",
+                "otherData": other_data
+            }, trace_fp, separators=(",", ":"))
+
+
+# =============================================================================
+# >> TRACE FUNCTIONS
+# =============================================================================
+def span(trace, name, category="configure", **args):
+    """Return a context manager recording a step via the given `BuildTrace` instance, or doing nothing if it's None."""
+    if trace is None:
+        return nullcontext()
+
+    return trace.span(name, category, **args)
@@ -2,10 +2,23 @@
 # >> IMPORTS
 # =============================================================================
 # Python Imports
+#   Hashlib
+import hashlib
 #   OS
 import os
 #   Pathlib
 from pathlib import Path
+#   RE
+import re
+#   Shlex
+import shlex
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# Matches characters which have to be escaped inside GNU-style response files
+_response_file_special_pattern = re.compile(r"""([\s'"\\])""")
 
 
 # =============================================================================
@@ -21,3 +34,52 @@ def recursive_mkdir(parts):
     for i in range(len(parts)):
         part = Path(os.sep.join(parts[:i]))
         Path(part).mkdir(exist_ok=True)
+
+
+def file_digest(path):
+    """Return the hex digest of a file's content."""
+    digest = hashlib.blake2b(digest_size=16)
+
+    with open(path, "rb") as file_fp:
+        while chunk := file_fp.read(1 << 16):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def format_command(arguments):
+    """Return command arguments as a shell-quoted string, e.g. for logging."""
+    return shlex.join(arguments)
+
+
+def format_response_file(arguments, separator="\n"):
+    """Return command arguments in the GNU response file format, each followed by `separator`, i.e. one per line by default."""
+    # Empty arguments have to be quoted, as empty lines are skipped
+    return "".join(
+        (_response_file_special_pattern.sub(r"\\\1", argument) or "''") + separator for argument in arguments
+    )
+
+
+def format_unity_source(batch_file, source_files):
+    """Return the content of a unity batch file including the given source files, relative to the batch file."""
+    batch_dir = batch_file.parent
+
+    return "".join(
+        f'#include "{Path(os.path.relpath(source_file, batch_dir)).as_posix()}"\n' for source_file in source_files
+    )
+
+
+def write_if_changed(path, text):
+    """Write text to a file unless it already holds that text, keeping its mtime otherwise, and return whether it was written."""
+    try:
+        if path.read_text() == text:
+            return False
+    except OSError:
+        pass
+
+    # Write to a temporary file first, so an interrupted run can't leave a truncated file behind
+    temp_path = path.with_name(f"{path.name}.tmp")
+    temp_path.write_text(text)
+    os.replace(temp_path, path)
+
+    return True
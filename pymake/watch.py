@@ -0,0 +1,237 @@
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+#   Ctypes
+import ctypes
+import ctypes.util
+#   OS
+import os
+#   Pathlib
+from pathlib import Path
+#   Select
+import select
+#   Struct
+import struct
+#   Time
+import time
+
+
+# =============================================================================
+# >> WATCHER BASE TYPE DEFINITION
+# =============================================================================
+class WatcherBase(object):
+    """Class used as a base for watching directories and files for changes."""
+
+    # Seconds without further changes after which a burst of changes is considered complete
+    debounce = 0.2
+
+    def __init__(self, directories, files):
+        """C'tor."""
+        # Store the watched directories and files, whose parent directories have to be watched as well
+        self.directories = tuple(dict.fromkeys(Path(directory) for directory in directories))
+        self.files = tuple(dict.fromkeys(Path(file) for file in files))
+
+    def __enter__(self):
+        """Return the watcher itself as context manager."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Stop watching when leaving the context."""
+        self.close()
+
+    @staticmethod
+    def create(directories, files):
+        """Return an `InotifyWatcher` instance if inotify is available, or a `PollingWatcher` instance otherwise."""
+        if InotifyWatcher.available():
+            try:
+                return InotifyWatcher(directories, files)
+            except OSError as error:
+                print(f"[WARN] Could not watch via inotify: {error}. Polling instead...")
+
+        return PollingWatcher(directories, files)
+
+    def poll(self, timeout):
+        """Return the set of paths changed within `timeout` seconds, or wait indefinitely if it's None."""
+        raise NotImplementedError(f"{type(self).__name__} has no clue how to poll for changes!")
+
+    def wait(self):
+        """Wait for a burst of changes to complete and return the set of changed paths."""
+        changes = self.poll(None)
+
+        # Collect further changes until things calm down, e.g. while an editor saves several files
+        while more_changes := self.poll(self.debounce):
+            changes |= more_changes
+
+        return changes
+
+    def close(self):
+        """Stop watching."""
+
+
+# =============================================================================
+# >> INOTIFY WATCHER TYPE DEFINITION
+# =============================================================================
+class InotifyWatcher(WatcherBase):
+    """Class used to watch directories and files via Linux inotify."""
+
+    # Event flags from <sys/inotify.h>
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+    IN_Q_OVERFLOW = 0x00004000
+    IN_ONLYDIR = 0x01000000
+
+    # Changes of directory entries and file content
+    mask = (
+        IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+        | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+    )
+
+    # The header of each event, i.e. `wd`, `mask`, `cookie` and `len` of `struct inotify_event`
+    event_header = struct.Struct("iIII")
+
+    # The C library, loaded on first use
+    libc = None
+
+    def __init__(self, directories, files):
+        """C'tor."""
+        super().__init__(directories, files)
+
+        if not InotifyWatcher.available():
+            raise OSError("inotify is not available")
+
+        self.fd = self.libc.inotify_init1(os.O_CLOEXEC | os.O_NONBLOCK)
+
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), os.strerror(ctypes.get_errno()))
+
+        # Watched directories by watch descriptor
+        self.watches = dict()
+
+        try:
+            # Files are watched via their directories, so editors replacing them are noticed as well
+            for directory in dict.fromkeys((*self.directories, *(file.parent for file in self.files))):
+                watch = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), self.mask)
+
+                if watch < 0:
+                    raise OSError(ctypes.get_errno(), f"{os.strerror(ctypes.get_errno())}: {directory}")
+
+                self.watches[watch] = directory
+        except OSError:
+            os.close(self.fd)
+            raise
+
+    @staticmethod
+    def available():
+        """Return whether inotify is available."""
+        if InotifyWatcher.libc is None:
+            try:
+                InotifyWatcher.libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            except OSError:
+                return False
+
+        return hasattr(InotifyWatcher.libc, "inotify_init1")
+
+    def poll(self, timeout):
+        """Return the set of paths changed within `timeout` seconds, or wait indefinitely if it's None."""
+        if not select.select((self.fd,), (), (), timeout)[0]:
+            return set()
+
+        changes = set()
+
+        while True:
+            try:
+                data = os.read(self.fd, 1 << 16)
+            except BlockingIOError:
+                break
+
+            offset = 0
+
+            while offset < len(data):
+                watch, mask, _, length = self.event_header.unpack_from(data, offset)
+                offset += self.event_header.size
+                name = data[offset:offset + length].rstrip(b"\0")
+                offset += length
+
+                # Too many events to tell what changed, so assume anything did
+                if mask & self.IN_Q_OVERFLOW:
+                    changes.update(self.directories)
+                    continue
+
+                directory = self.watches.get(watch)
+
+                if directory is not None:
+                    changes.add(directory.joinpath(os.fsdecode(name)) if name else directory)
+
+        return changes
+
+    def close(self):
+        """Stop watching."""
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+# =============================================================================
+# >> POLLING WATCHER TYPE DEFINITION
+# =============================================================================
+class PollingWatcher(WatcherBase):
+    """Class used to watch directories and files by comparing their mtimes periodically."""
+
+    # Seconds between polls
+    interval = 0.5
+
+    def __init__(self, directories, files):
+        """C'tor."""
+        super().__init__(directories, files)
+
+        # The current mtimes by path
+        self.stamps = self.snapshot()
+
+    def snapshot(self):
+        """Return the mtimes of the watched files, directories and the files inside them by path."""
+        stamps = dict()
+
+        for directory in self.directories:
+            try:
+                stamps[directory] = os.stat(directory).st_mtime_ns
+
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_file():
+                            stamps[Path(entry.path)] = entry.stat().st_mtime_ns
+            except OSError:
+                stamps[directory] = None
+
+        for file in self.files:
+            try:
+                stamps[file] = os.stat(file).st_mtime_ns
+            except OSError:
+                stamps[file] = None
+
+        return stamps
+
+    def poll(self, timeout):
+        """Return the set of paths changed within `timeout` seconds, or wait indefinitely if it's None."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            stamps = self.snapshot()
+
+            changes = {
+                path for path in stamps.keys() | self.stamps.keys() if stamps.get(path) != self.stamps.get(path)
+            }
+
+            self.stamps = stamps
+
+            if changes or (deadline is not None and time.monotonic() >= deadline):
+                return changes
+
+            time.sleep(self.interval if deadline is None else max(0.0, min(self.interval, deadline - time.monotonic())))
@@ -0,0 +1,56 @@
+#!/bin/env python3
+"""
+Thin client asking a PyMake daemon started via `pymake.py --daemon` to build, printing its output.
+"""
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+#   JSON
+import json
+#   Socket
+import socket
+#   Sys
+import sys
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# The socket path of the daemon, relative to the directory holding 'pymake.yml'
+SOCKET_PATH = ".pymake/daemon.sock"
+
+
+# =============================================================================
+# >> CLIENT FUNCTIONS
+# =============================================================================
+def main(args):
+    """Send the command line arguments to the daemon and return the exit code of the build."""
+    # Stop the daemon instead of building, if requested
+    request = {"stop": True} if args == ["--stop"] else {"args": args}
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(SOCKET_PATH)
+        except OSError:
+            print(f"[ERROR] No PyMake daemon is listening on {SOCKET_PATH}, start one via 'pymake.py --daemon'.")
+            return 2
+
+        client.sendall(f"{json.dumps(request)}\n".encode())
+
+        # Print the build output as it's streamed back, until the exit code arrives
+        for line in client.makefile("rb"):
+            message = json.loads(line)
+
+            if "exit_code" in message:
+                return message["exit_code"]
+
+            sys.stdout.write(message["output"])
+            sys.stdout.flush()
+
+    print("[ERROR] The PyMake daemon went away.")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
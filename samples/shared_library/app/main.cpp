@@ -0,0 +1,12 @@
+
+/* Ensures that the shared library is found at runtime. */
+#include "../greeter/greeter.hpp"
+
+#include <iostream>
+
+
+int main(int argc, char *argv[])
+{
+    std::cout << greeting() << '\n';
+    return 0;
+}
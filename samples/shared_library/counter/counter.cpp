@@ -0,0 +1,12 @@
+
+/* Defines the counter, whose global variable requires position independent code inside a shared library. */
+#include "counter.hpp"
+
+
+int counter = 0;
+
+
+int next_count()
+{
+    return ++counter;
+}
@@ -0,0 +1,6 @@
+
+/* Declares the counter of the static library linked into the shared library. */
+#pragma once
+
+
+int next_count();
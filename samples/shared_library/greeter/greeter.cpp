@@ -0,0 +1,11 @@
+
+/* Defines the function exported by the shared library. */
+#include "greeter.hpp"
+
+#include "../counter/counter.hpp"
+
+
+std::string greeting()
+{
+    return "Hello from a shared library, greeting #" + std::to_string(next_count()) + "!";
+}
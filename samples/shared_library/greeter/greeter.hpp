@@ -0,0 +1,8 @@
+
+/* Declares the function exported by the shared library. */
+#pragma once
+
+#include <string>
+
+
+std::string greeting();
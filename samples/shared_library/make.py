@@ -0,0 +1,21 @@
+import subprocess
+import tempfile
+
+from pymake.listeners import PostBuildTarget
+
+
+@PostBuildTarget()
+def target_post_build(target_data, toolchain):
+    if target_data.is_library:
+        return
+
+    # The executable has to find the shared library from any working directory, not just the project dir
+    executable = toolchain.output_path(target_data).resolve()
+
+    with tempfile.TemporaryDirectory() as working_dir:
+        result = subprocess.run((executable.as_posix(),), cwd=working_dir, capture_output=True, text=True)
+
+    if result.returncode != 0:
+        raise RuntimeError(f"{executable} failed to run from {working_dir}: {result.stderr.strip()}")
+
+    print("PostBuildTarget:", target_data, "runs from another working directory:", result.stdout.strip(), "\n")
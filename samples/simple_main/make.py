@@ -11,6 +11,8 @@ from pymake.listeners import PostConfigureTarget
 from pymake.listeners import PreBuildTarget
 from pymake.listeners import PostBuildTarget
 
+from pymake.listeners import PostBuildJobs
+
 
 @PreConfigureProject()
 def project_pre_configure(source_dir, build_dir):
@@ -44,9 +46,16 @@ def target_post_configure(target_data):
 
 @PreBuildTarget()
 def target_pre_build(target_data, toolchain):
-    print("PreBuildTarget:", target_data, "\n", toolchain.build_command(target_data), "\n")
+    print("PreBuildTarget:", target_data, "via", toolchain.name, "\n")
 
 
 @PostBuildTarget()
 def target_post_build(target_data, toolchain):
-    print("PostBuildTarget:", target_data, "\n", toolchain.build_command(target_data), "\n")
+    print("PostBuildTarget:", target_data, "\n", toolchain.output_path(target_data), "\n")
+
+
+@PostBuildJobs()
+def jobs_post_build(results):
+    for result in results:
+        status = "cached" if result.cache_hit else f"exit code {result.exit_code}"
+        print("PostBuildJobs:", result.job, f"({status}, {result.duration:.2f}s)", "\n", result.job.command_line, "\n")